@@ -1,14 +1,17 @@
 #!/usr/bin/env python
 
-import os
 import time
-from ApiClient import ApiClient
+from FeedPoller import FeedPoller
+from FeedDiff import FeedDiff
 from Colors import Colors
 from FlagStatus import FlagStatus
 from Series import Series
 from samplebase import SampleBase
 from rgbmatrix import graphics
-from PIL import Image
+from TextMetrics import TextMetrics
+from BadgeCache import BadgeCache
+from PylonConfig import PylonConfig
+from PanelLayout import PanelLayout
 
 # Dictionary to map series to their corresponding badge directory numbers
 series_badge_dir = {
@@ -17,7 +20,6 @@ series_badge_dir = {
     Series.TRUCKS: '3'
 }
 
-positionChange = {}
 
 class RunText(SampleBase):
     def __init__(self, *args, **kwargs):
@@ -42,11 +44,14 @@ class RunText(SampleBase):
 
     def run(self):
         series = Series.CUP  # Change this to the desired series
-        client = ApiClient()
-        feed = client.getLiveFeed(series)
+        poller = FeedPoller(series)
+        poller.start()
+        feed = poller.waitForFirst().feed
+        previous_feed = None
         offscreen_canvas = self.matrix.CreateFrameCanvas()
         font = graphics.Font()
         font.LoadFont("../../../fonts/4x6.bdf")
+        metrics = TextMetrics(font)
         whiteColor = graphics.Color(255, 255, 255)
         greenColor = graphics.Color(0, 255, 0)
         redColor = graphics.Color(255, 0, 0)
@@ -56,19 +61,22 @@ class RunText(SampleBase):
         matrix_width = self.matrix.width
         matrix_height = self.matrix.height
 
+        # Header band and rows placed for the configured panel geometry
+        layout = PanelLayout.fromConfig(PylonConfig(), matrix_width, matrix_height)
+        frame = graphics.DrawList()
+
         # Get the badge directory number based on the series
         badge_dir_number = series_badge_dir.get(series, '1')
-        base_badge_path = '/home/tonicinnovations/badges'
+        badges = BadgeCache(size=(layout.badgeSize, layout.badgeSize))
 
         # Helper function to calculate text width
         def calculate_text_width(text):
-            char_width = 4
-            char_spacing = 1
-            return len(text) * char_width + (len(text) - 1) * char_spacing
+            return metrics.width(text)
 
         while feed.lapsToGo >= 0:
+            diff = FeedDiff(previous_feed, feed)
             offscreen_canvas.Clear()
-            i = 1
+            frame.Clear()
 
             # Determine background color based on flag status
             if feed.flagStatus == FlagStatus.GREEN:
@@ -81,64 +89,47 @@ class RunText(SampleBase):
                 bgColor = redColor  # Default color
 
             # Draw filled rectangle for header
-            for y in range(0, 14):
-                graphics.DrawLine(offscreen_canvas, 0, y, matrix_width - 1, y, bgColor)
+            layout.fillRect(frame, 0, 0, matrix_width, layout.headerHeight, bgColor)
 
             # Create the text lines
             laps_text = f'{feed.lapsToGo} Laps'
             togo_text = "To Go"
-            top = 6
+            laps_baseline, togo_baseline = layout.headerBaselines
 
             # Calculate center positions for the text
             laps_text_pos = (matrix_width - calculate_text_width(laps_text)) // 2
             togo_text_pos = (matrix_width - calculate_text_width(togo_text)) // 2
 
             # Draw the header text
-            graphics.DrawText(offscreen_canvas, font, laps_text_pos, top, whiteColor, laps_text)
-            graphics.DrawText(offscreen_canvas, font, togo_text_pos, top + 7, whiteColor, togo_text)
-
-            # Start position for the vehicle list
-            top = 16
+            layout.drawText(frame, font, laps_text_pos, laps_baseline, whiteColor, laps_text)
+            layout.drawText(frame, font, togo_text_pos, togo_baseline, whiteColor, togo_text)
 
-            for vehicle in feed.vehicles:
-                previous_position = positionChange.get(vehicle.vehicleNumber, i)
-                if previous_position < i:
+            # One vehicle per row of the layout, as many as fit (at most 40)
+            for i, (vehicle, top) in enumerate(zip(feed.vehicles, layout.rowTops), 1):
+                movement = diff.movement(vehicle.vehicleNumber)
+                if movement < 0:
                     textColor = redColor
-                elif previous_position > i:
+                elif movement > 0:
                     textColor = greenColor
                 else:
                     textColor = whiteColor
-                positionChange[vehicle.vehicleNumber] = i
 
                 # Draw the position number
-                graphics.DrawText(offscreen_canvas, font, 2, top + 8, whiteColor, f'{i}')
+                layout.drawText(frame, font, layout.positionX, top + 8, whiteColor, f'{i}')
 
-                # Construct the image path based on the series
-                image_path = os.path.join(base_badge_path, badge_dir_number, f'{vehicle.vehicleNumber}.png')
-
-                try:
-                    badge_image = Image.open(image_path).convert('RGB')
-                    badge_image = badge_image.resize((16, 16), Image.LANCZOS)
-                    offscreen_canvas.SetImage(badge_image, 12, top)
-                except IOError:
+                # Decoded and resized once, not every frame
+                badge_image = badges.get(badge_dir_number, vehicle.vehicleNumber)
+                if badge_image is not None:
+                    layout.setImage(frame, badge_image, layout.badgeX, top)
+                else:
                     # If image not found, draw the car number as text
-                    graphics.DrawText(offscreen_canvas, font, 12, top + 8, textColor, f'{vehicle.vehicleNumber:>2}')
-
-                top += 16  # Adjust increment to fit more vehicles
-                i += 1
-
-                # Break after displaying 40 vehicles
-                if i > 40:
-                    break
-
-                # Optionally implement scrolling if top exceeds matrix height
-                if top > matrix_height - 16:
-                    # Implement scrolling logic here if desired
-                    break
+                    layout.drawText(frame, font, layout.badgeX, top + 8, textColor, f'{vehicle.vehicleNumber:>2}')
 
+            frame.Draw(offscreen_canvas)
             offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas)
             time.sleep(2)
-            feed = client.getLiveFeed(series)
+            previous_feed = feed
+            feed = poller.latest().feed
 
 if __name__ == "__main__":
     run_text = RunText()
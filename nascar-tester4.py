@@ -1,13 +1,16 @@
 #!/usr/bin/env python
 
 import os
-import time
-from ApiClient import ApiClient
+from FeedPoller import FeedPoller
 from Colors import Colors
 from FlagStatus import FlagStatus
 from Series import Series
 from samplebase import SampleBase
 from rgbmatrix import graphics
+from TextMetrics import TextMetrics
+from OverflowScroller import OverflowScroller
+from PylonConfig import PylonConfig
+from PanelLayout import PanelLayout
 from PIL import Image
 
 # Dictionary to map series to their corresponding badge directory numbers
@@ -17,11 +20,12 @@ series_badge_dir = {
     Series.TRUCKS: '3'
 }
 
-positionChange = {}
 
 class RunText(SampleBase):
     def __init__(self, *args, **kwargs):
         super(RunText, self).__init__(*args, **kwargs)
+        self.parser.add_argument("--framerate-fraction", type=int, default=4, help="Show a new frame every Nth panel refresh. Default: 4")
+        self.parser.add_argument("--scroll-dwell", type=float, default=2.0, help="Seconds each overflow car is shown before scrolling on. Default: 2")
 
     def flag(self, flag_status):
         if flag_status == FlagStatus.NONE:
@@ -42,13 +46,15 @@ class RunText(SampleBase):
 
     def run(self):
         series = Series.CUP  # Change this to the desired series
-        client = ApiClient()
-        feed = client.getLiveFeed(series)
+        poller = FeedPoller(series)
+        poller.start()
+        feed = poller.waitForFirst().feed
         offscreen_canvas = self.matrix.CreateFrameCanvas()
 
         # Load a small font
         font = graphics.Font()
         font.LoadFont("../../../fonts/5x7.bdf")
+        metrics = TextMetrics(font)
         whiteColor = graphics.Color(255, 255, 255)
         greenColor = graphics.Color(0, 255, 0)
         redColor = graphics.Color(255, 0, 0)
@@ -59,6 +65,14 @@ class RunText(SampleBase):
         matrix_width = self.matrix.width
         matrix_height = self.matrix.height
 
+        # Calculate space per vehicle: every 7px row that fits below the
+        # header, placed for the configured panel geometry
+        vehicle_height = 7  # Adjusted per vehicle
+        layout = PanelLayout.fromConfig(PylonConfig(), matrix_width, matrix_height, rowTop=16,
+                                        rowPitch=vehicle_height, maxRows=matrix_height,
+                                        positionX=2, badgeX=10, badgeSize=5)
+        max_static_vehicles = min(layout.rowCount, 30)
+
         # Get the badge directory number based on the series
         badge_dir_number = series_badge_dir.get(series, '1')
         base_badge_path = '/home/tonicinnovations/badges'
@@ -69,30 +83,49 @@ class RunText(SampleBase):
             image_path = os.path.join(base_badge_path, badge_dir_number, f'{vehicle.vehicleNumber}.png')
             try:
                 badge_image = Image.open(image_path).convert('RGB')
-                badge_image = badge_image.resize((5, 5), Image.NEAREST)
+                badge_image = badge_image.resize((layout.badgeSize, layout.badgeSize), Image.NEAREST)
                 badge_images[vehicle.vehicleNumber] = badge_image
             except IOError:
                 badge_images[vehicle.vehicleNumber] = None  # Mark as missing
 
-        # Calculate space per vehicle
-        header_height = 16
-        vehicle_height = 7  # Adjusted per vehicle
-        available_height = matrix_height - header_height
-        max_static_vehicles = min(available_height // vehicle_height, 30)
-
-        # Implement scrolling for the remaining vehicles
-        total_vehicles = len(feed.vehicles)
-        scrolling_vehicles = feed.vehicles[max_static_vehicles:]
+        # The remaining vehicles page through the rows below the static list,
+        # animated against the clock so the feed keeps updating meanwhile
+        overflow_slots = max(layout.rowCount - max_static_vehicles, 1)
+        scroller = OverflowScroller(vehicle_height, slots=overflow_slots, dwell=self.args.scroll_dwell)
+        framerate_fraction = self.args.framerate_fraction
+        frame = graphics.DrawList()
 
         # Helper function to calculate text width
-        def calculate_text_width(text, font):
-            width = 0
-            for char in text:
-                width += font.CharacterWidth(ord(char)) + 1  # Add 1 for spacing
-            return width - 1  # Subtract extra spacing at the end
+        def calculate_text_width(text):
+            return metrics.width(text)
+
+        def draw_vehicle(position, vehicle, top):
+            # Draw the position number
+            layout.drawText(frame, font, layout.positionX, top + 5, whiteColor, f'{position}')
+
+            # Draw badge image or vehicle number
+            badge_image = badge_images.get(vehicle.vehicleNumber)
+            if badge_image:
+                layout.setImage(frame, badge_image, layout.badgeX, top)
+            else:
+                layout.drawText(frame, font, layout.badgeX, top + 5, whiteColor, f'{vehicle.vehicleNumber}')
 
         while feed.lapsToGo >= 0:
             offscreen_canvas.Clear()
+            frame.Clear()
+
+            # Scrolling vehicles first; the rows around the overflow area are
+            # then cleared and redrawn over anything sliding past its edges
+            positions = list(enumerate(feed.vehicles, 1))
+            for (position, vehicle), offset in scroller.visible(positions[max_static_vehicles:]):
+                draw_vehicle(position, vehicle, layout.rowY(max_static_vehicles, offset))
+            mask_top = layout.rowY(max_static_vehicles - 1)
+            layout.fillRect(frame, 0, mask_top, matrix_width, layout.rowY(max_static_vehicles) - mask_top, blackColor)
+            layout.fillRect(frame, 0, layout.rowY(max_static_vehicles + overflow_slots), matrix_width, vehicle_height, blackColor)
+
+            # Display the first 30 vehicles statically
+            for (position, vehicle), top in zip(positions[:max_static_vehicles], layout.rowTops):
+                draw_vehicle(position, vehicle, top)
 
             # Determine text color based on flag status
             if feed.flagStatus == FlagStatus.GREEN:
@@ -109,71 +142,25 @@ class RunText(SampleBase):
             togo_text = "To Go"
 
             # Calculate center positions for the text
-            laps_text_width = calculate_text_width(laps_text, font)
-            togo_text_width = calculate_text_width(togo_text, font)
+            laps_text_width = calculate_text_width(laps_text)
+            togo_text_width = calculate_text_width(togo_text)
             laps_text_pos = (matrix_width - laps_text_width) // 2
             togo_text_pos = (matrix_width - togo_text_width) // 2
 
             # Draw the header text without background rectangle
-            graphics.DrawText(offscreen_canvas, font, laps_text_pos, 6, textColor, laps_text)
-            graphics.DrawText(offscreen_canvas, font, togo_text_pos, 13, textColor, togo_text)
+            laps_baseline, togo_baseline = layout.headerBaselines
+            layout.drawText(frame, font, laps_text_pos, laps_baseline, textColor, laps_text)
+            layout.drawText(frame, font, togo_text_pos, togo_baseline, textColor, togo_text)
 
-            # Start position for the vehicle list
-            top = header_height
-            i = 1
-
-            # Display the first 30 vehicles statically
-            for vehicle in feed.vehicles[:max_static_vehicles]:
-                # Draw the position number
-                graphics.DrawText(offscreen_canvas, font, 2, top + 5, whiteColor, f'{i}')
-
-                # Draw badge image or vehicle number
-                badge_image = badge_images.get(vehicle.vehicleNumber)
-                if badge_image:
-                    offscreen_canvas.SetImage(badge_image, 10, top)
-                else:
-                    graphics.DrawText(offscreen_canvas, font, 10, top + 5, whiteColor, f'{vehicle.vehicleNumber}')
-
-                top += vehicle_height
-                i += 1
-
-            # Display scrolling vehicles at the bottom
-            if scrolling_vehicles:
-                for scroll_vehicle in scrolling_vehicles:
-                    # Draw the scrolling vehicle
-                    graphics.DrawText(offscreen_canvas, font, 2, top + 5, whiteColor, f'{i}')
-                    badge_image = badge_images.get(scroll_vehicle.vehicleNumber)
-                    if badge_image:
-                        offscreen_canvas.SetImage(badge_image, 10, top)
-                    else:
-                        graphics.DrawText(offscreen_canvas, font, 10, top + 5, whiteColor, f'{scroll_vehicle.vehicleNumber}')
-
-                    # Swap the canvas to update the display
-                    offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas)
-                    time.sleep(2)  # Adjust scrolling speed
-
-                    # Clear the scrolling vehicle for the next one
-                    # Clear position number
-                    graphics.DrawText(offscreen_canvas, font, 2, top + 5, blackColor, f'{i}')
-                    # Clear badge image or vehicle number
-                    if badge_image:
-                        # Clear the image by drawing black lines over it
-                        for y in range(top, top + 5):
-                            graphics.DrawLine(offscreen_canvas, 10, y, 14, y, blackColor)
-                    else:
-                        graphics.DrawText(offscreen_canvas, font, 10, top + 5, blackColor, f'{scroll_vehicle.vehicleNumber}')
-
-                    i += 1
-            else:
-                # Swap the canvas if no scrolling vehicles
-                offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas)
-                time.sleep(2)
+            frame.Draw(offscreen_canvas)
+            # Paced by the panel refresh rather than sleeping
+            offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas, framerate_fraction)
 
             # Update feed
-            feed = client.getLiveFeed(series)
+            feed = poller.latest().feed
 
-    if __name__ == "__main__":
-        run_text = RunText()
-        if not run_text.process():
-            run_text.print_help()
+if __name__ == "__main__":
+    run_text = RunText()
+    if not run_text.process():
+        run_text.print_help()
 
@@ -1,27 +1,43 @@
 #!/usr/bin/env python
 
-import os
 import time
-from ApiClient import ApiClient
+from FeedPoller import FeedPoller
+from FeedRecorder import FeedRecorder
+from ReplayApiClient import ReplayApiClient
+from FeedDiff import FeedDiff
+from PylonConfig import PylonConfig
 from Colors import Colors
 from FlagStatus import FlagStatus
 from Series import Series
 from samplebase import SampleBase
 from rgbmatrix import graphics
-from PIL import Image
+from TextMetrics import TextMetrics
+from BadgeCache import BadgeCache
+from BdfFont import BdfFont
+from RowSprites import RowSprites
+from RowTransitions import RowTransitions
+from PanelLayout import PanelLayout
+from FrameCompositor import FrameCompositor
+from FrameMemo import FrameMemo
 
 # Dictionary to map series to their corresponding badge directory numbers
 series_badge_dir = {
     Series.CUP: '1',
     Series.XFINITY: '2',
-    Series.TRUCKS: '3'
+    Series.TRUCKS: '3',
+    Series.ARCA: '4'
 }
 
-positionChange = {}
 
 class RunText(SampleBase):
     def __init__(self, *args, **kwargs):
         super(RunText, self).__init__(*args, **kwargs)
+        self.parser.add_argument("--record", help="Append every raw feed response to this capture file")
+        self.parser.add_argument("--replay", help="Replay a capture file instead of polling the live feed")
+        self.parser.add_argument("--replay-speed", type=float, default=1.0, help="Replay speed multiplier, 0 for as fast as possible. Default: 1")
+        self.parser.add_argument("--transition-frames", type=int, default=8, help="Frames a row takes to slide to its new position, 1 to jump. Default: 8")
+        self.parser.add_argument("--framerate-fraction", type=int, default=4, help="Show a new frame every Nth panel refresh. Default: 4")
+        self.parser.add_argument("--compositor", action="store_true", help="Build each frame as one NumPy array and push it in a single call (needs numpy)")
 
     def flag(self, flag_status):
         if flag_status == FlagStatus.NONE:
@@ -41,46 +57,81 @@ class RunText(SampleBase):
         return ""
 
     def run(self):
-        series = Series.TRUCKS  # Change this to the desired series
-        client = ApiClient()
-        feed = client.getLiveFeed(series)
+        # Series comes from the web UI; the others are kept warm so switching is instant
+        config = PylonConfig()
+        series = config.series
+        if self.args.replay:
+            speed = self.args.replay_speed
+            poller = FeedPoller(series, interval=2 / speed if speed > 0 else 0,
+                                client=ReplayApiClient(self.args.replay, speed))
+        else:
+            poller = FeedPoller(series, recorder=FeedRecorder(self.args.record) if self.args.record else None,
+                                standbySeries=list(Series), opsFeedUrl=config.get('feed_hub'))
+        poller.start()
+        feed = poller.waitForFirst().feed
+        previous_feed = None
         offscreen_canvas = self.matrix.CreateFrameCanvas()
         font = graphics.Font()
         font.LoadFont("../../../fonts/4x6.bdf")
+        metrics = TextMetrics(font)
         whiteColor = graphics.Color(255, 255, 255)
         greenColor = graphics.Color(0, 255, 0)
         redColor = graphics.Color(255, 0, 0)
         yellowColor = graphics.Color(255, 255, 0)
+        blackColor = graphics.Color(0, 0, 0)
 
         # Use actual matrix dimensions
         matrix_width = self.matrix.width
         matrix_height = self.matrix.height
 
-        # PANEL LAYOUT ASSUMPTION:
-        # - 8 panels tall, each 32px high
-        # - panel 1 (header) is at the *top* physically
-        # - When we draw at y=0, it shows on panel 8 (bottom).
-        # So: header must be drawn in the band [matrix_height-32 .. matrix_height-1].
-        PANEL_HEIGHT = 32
-        header_y_start = matrix_height - PANEL_HEIGHT       # top physical panel
-        header_height = 14
-        header_y_end = min(header_y_start + header_height, matrix_height)
+        # Header band, rows and badge slot for this panel geometry, in pylon
+        # coordinates (y=0 at the physical top); the layout maps them onto
+        # the canvas, where y=0 shows on the bottom panel.
+        layout = PanelLayout.fromConfig(config, matrix_width, matrix_height)
 
         # Get the badge directory number based on the series
         badge_dir_number = series_badge_dir.get(series, '1')
-        base_badge_path = '/home/tonicinnovations/badges'
+        badges = BadgeCache(size=(layout.badgeSize, layout.badgeSize))
+        bdf_font = BdfFont("../../../fonts/4x6.bdf")
+        rows = RowSprites(bdf_font, badges, height=layout.rowPitch,
+                          badgeX=layout.badgeX, positionX=layout.positionX)
 
         # Helper function to calculate text width
         def calculate_text_width(text):
-            char_width = 4
-            char_spacing = 1
-            if not text:
-                return 0
-            return len(text) * char_width + (len(text) - 1) * char_spacing
+            return metrics.width(text)
+
+        # Static layer (blank board plus header band in the flag colour),
+        # redrawn only when the flag changes and copied in each frame
+        # instead of clearing and repainting the band.
+        background_canvas = self.matrix.CreateFrameCanvas()
+        background = graphics.DrawList()
+        background_color = None
+
+        # Everything drawn on top of it is queued here and drawn natively in
+        # one call per frame: the header once per feed, the rows per frame
+        header = graphics.DrawList()
+        frame = graphics.DrawList()
+
+        # Rows slide to their new positions over a few frames when the
+        # order changes, paced by the panel refresh
+        transitions = RowTransitions(rowHeight=layout.rowPitch, frames=self.args.transition_frames, layout=layout)
+        framerate_fraction = self.args.framerate_fraction
+
+        # Optionally compose whole frames in NumPy instead: the header once
+        # per feed, the rows below it per frame, then one bulk push
+        compositor = None
+        if self.args.compositor:
+            if FrameCompositor.available:
+                compositor = FrameCompositor(layout, bdf_font)
+            else:
+                print("numpy is not installed, drawing with DrawLists instead")
+
+        # What the sign currently shows, to skip cycles that would not change it
+        memo = FrameMemo()
 
         while feed.lapsToGo >= 0:
-            offscreen_canvas.Clear()
-            i = 1
+            diff = FeedDiff(previous_feed, feed)
+            cycle_start = time.monotonic()
 
             # Determine background color based on flag status
             if feed.flagStatus == FlagStatus.GREEN:
@@ -92,70 +143,107 @@ class RunText(SampleBase):
             else:
                 bgColor = redColor  # Default color
 
-            # ================= HEADER (now on physical panel 1) =================
-            # Draw filled rectangle for header in that top band
-            for y in range(header_y_start, header_y_end):
-                graphics.DrawLine(offscreen_canvas, 0, y, matrix_width - 1, y, bgColor)
-
-            # Create the text lines
-            laps_text = f'{feed.lapsToGo} Laps'
-            togo_text = "To Go"
-
-            # Vertical positions inside that header band
-            text_baseline_laps = header_y_start + 6
-            text_baseline_togo = text_baseline_laps + 7
-
-            # Calculate center positions for the text
-            laps_text_pos = (matrix_width - calculate_text_width(laps_text)) // 2
-            togo_text_pos = (matrix_width - calculate_text_width(togo_text)) // 2
-
-            # Draw the header text
-            graphics.DrawText(offscreen_canvas, font, laps_text_pos, text_baseline_laps, whiteColor, laps_text)
-            graphics.DrawText(offscreen_canvas, font, togo_text_pos, text_baseline_togo, whiteColor, togo_text)
-
-            # ================= VEHICLE LIST (unchanged for now) =================
-            # Start position for the vehicle list as before (this will still be in the "old" area)
-            top = 16
-
-            for vehicle in feed.vehicles:
-                previous_position = positionChange.get(vehicle.vehicleNumber, i)
-                if previous_position < i:
-                    textColor = redColor
-                elif previous_position > i:
-                    textColor = greenColor
+            # Upstream has been failing for a while: keep showing the last good
+            # feed, but mark the header corner so nobody mistakes it for live.
+            stale = poller.isStale()
+
+            # Same picture as the frame already on the sign (a repeated poll
+            # under caution, say): skip the redraw and the swap altogether
+            state = FrameMemo.stateKey(feed, diff, config.get('display'), config.get('favorite_driver'),
+                                       stale, badge_dir_number, badges.generation(badge_dir_number))
+            if memo.check(state):
+                steps = 0
+            else:
+                # ================= HEADER (physical panel 1) =================
+                # Create the text lines
+                laps_text = f'{feed.lapsToGo} Laps'
+                togo_text = "To Go"
+
+                # Calculate center positions for the text
+                laps_text_pos = (matrix_width - calculate_text_width(laps_text)) // 2
+                togo_text_pos = (matrix_width - calculate_text_width(togo_text)) // 2
+
+                if compositor is not None:
+                    text_baseline_laps, text_baseline_togo = layout.headerBaselines
+                    compositor.fill(0, 0, matrix_width, layout.rowTop, (0, 0, 0))
+                    compositor.fill(0, 0, matrix_width, layout.headerHeight, (bgColor.red, bgColor.green, bgColor.blue))
+                    compositor.text(laps_text_pos, text_baseline_laps, (255, 255, 255), laps_text)
+                    compositor.text(togo_text_pos, text_baseline_togo, (255, 255, 255), togo_text)
+                    if stale:
+                        compositor.fill(matrix_width - 3, 0, 3, 3, (0, 0, 0))
+                else:
+                    # Draw filled rectangle for header in that top band
+                    if bgColor is not background_color:
+                        background_canvas.Clear()
+                        background.Clear()
+                        layout.fillRect(background, 0, 0, matrix_width, layout.headerHeight, bgColor)
+                        background.Draw(background_canvas)
+                        background_color = bgColor
+                    header.Clear()
+
+                    # Vertical positions inside that header band
+                    text_baseline_laps, text_baseline_togo = layout.headerBaselineYs
+
+                    # Draw the header text
+                    header.DrawText(font, laps_text_pos, text_baseline_laps, whiteColor, laps_text)
+                    header.DrawText(font, togo_text_pos, text_baseline_togo, whiteColor, togo_text)
+                    if stale:
+                        layout.fillRect(header, matrix_width - 3, 0, 3, 3, blackColor)
+
+                # ================= VEHICLE LIST =================
+                # One row per car from the layout's row table, down to the last
+                # row that fits (at most 40)
+                steps = transitions.start(diff)
+
+            for step in range(1, steps + 1):
+                if compositor is not None:
+                    compositor.fill(0, layout.rowTop, matrix_width, matrix_height - layout.rowTop, (0, 0, 0))
+                else:
+                    offscreen_canvas.CopyFrom(background_canvas)
+                    frame.Clear()
+                for i, vehicle, top in transitions.rows(step, steps):
+                    # Cars sliding out of (or into) view are drawn until they
+                    # pass the last row
+                    if top > layout.lastRowTop:
+                        continue
+
+                    movement = diff.movement(vehicle.vehicleNumber)
+                    if movement < 0:
+                        textColor = redColor
+                    elif movement > 0:
+                        textColor = greenColor
+                    else:
+                        textColor = whiteColor
+
+                    # Position number plus badge (or the car number as text if
+                    # there is no badge), rendered once per variant and blitted
+                    row_sprite = rows.get(i, vehicle.vehicleNumber, badge_dir_number,
+                                          (textColor.red, textColor.green, textColor.blue))
+                    if compositor is not None:
+                        compositor.image(row_sprite, 0, top)
+                    else:
+                        layout.setImage(frame, row_sprite, 0, top)
+
+                if compositor is not None:
+                    compositor.push(offscreen_canvas)
                 else:
-                    textColor = whiteColor
-                positionChange[vehicle.vehicleNumber] = i
-
-                # Draw the position number
-                graphics.DrawText(offscreen_canvas, font, 2, top + 8, whiteColor, f'{i}')
-
-                # Construct the image path based on the series
-                image_path = os.path.join(base_badge_path, badge_dir_number, f'{vehicle.vehicleNumber}.png')
-
-                try:
-                    badge_image = Image.open(image_path).convert('RGB')
-                    badge_image = badge_image.resize((16, 16), Image.LANCZOS)
-                    offscreen_canvas.SetImage(badge_image, 12, top)
-                except IOError:
-                    # If image not found, draw the car number as text
-                    graphics.DrawText(offscreen_canvas, font, 12, top + 8, textColor, f'{vehicle.vehicleNumber:>2}')
-
-                top += 16  # Adjust increment to fit more vehicles
-                i += 1
-
-                # Break after displaying 40 vehicles
-                if i > 40:
-                    break
-
-                # Optionally implement scrolling if top exceeds matrix height
-                if top > matrix_height - 16:
-                    # Implement scrolling logic here if desired
-                    break
-
-            offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas)
-            time.sleep(2)
-            feed = client.getLiveFeed(series)
+                    header.Draw(offscreen_canvas)
+                    frame.Draw(offscreen_canvas)
+                offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas, framerate_fraction)
+
+            time.sleep(max(2 - (time.monotonic() - cycle_start), 0))
+            previous_feed = feed
+            if config.reload() and config.series != series:
+                series = config.series
+                poller.setSeries(series)
+                badge_dir_number = series_badge_dir.get(series, '1')
+                previous_feed = None
+            # Play the race sync_delay seconds behind live to match the TV
+            snapshot = poller.delayed(float(config.get('sync_delay') or 0))
+            if snapshot is not None:
+                feed = snapshot.feed
+
+        print('frame memo', memo.stats())
 
 if __name__ == "__main__":
     run_text = RunText()
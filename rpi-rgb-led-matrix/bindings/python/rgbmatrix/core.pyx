@@ -20,15 +20,9 @@ cdef class Canvas:
             img_width, img_height = image.size
             self.SetPixelsPillow(offset_x, offset_y, img_width, img_height, image)
         else:
-            # First implementation of a SetImage(). OPTIMIZE_ME: A more native
-            # implementation that directly reads the buffer and calls the underlying
-            # C functions can certainly be faster.
+            # One copy out of PIL, then the same native loop as any other buffer
             img_width, img_height = image.size
-            pixels = image.load()
-            for x in range(max(0, -offset_x), min(img_width, self.width - offset_x)):
-                for y in range(max(0, -offset_y), min(img_height, self.height - offset_y)):
-                    (r, g, b) = pixels[x, y]
-                    self.SetPixel(x + offset_x, y + offset_y, r, g, b)
+            self.SetPixelsFromBuffer(offset_x, offset_y, img_width, img_height, image.tobytes())
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -52,6 +46,30 @@ cdef class Canvas:
                 b = (pixel >> 16) & 0xFF
                 my_canvas.SetPixel(xstart+col, ystart+row, r, g, b)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def SetPixelsFromBuffer(self, int xstart, int ystart, int width, int height, buf):
+        # Draws a width x height block of packed 8-bit RGB (row-major, 3 bytes
+        # per pixel) from any C-contiguous buffer: bytes, bytearray, mmap,
+        # memoryview or a (height, width, 3) uint8 NumPy array. The buffer is
+        # read in place and the GIL is released while drawing.
+        view = memoryview(buf)
+        if view.itemsize != 1:
+            raise ValueError("SetPixelsFromBuffer() needs a buffer of bytes, e.g. a uint8 array")
+        if width < 0 or height < 0 or view.nbytes < width * height * 3:
+            raise ValueError("Buffer is smaller than width * height * 3")
+        cdef const uint8_t[::1] pixels = view.cast('B') if view.ndim != 1 or view.format != 'B' else view
+        cdef cppinc.Canvas *canvas = self._getCanvas()
+        cdef int frame_width = canvas.width()
+        cdef int frame_height = canvas.height()
+        cdef int row, col, offset
+        with nogil:
+            for row in range(max(0, -ystart), min(height, frame_height - ystart)):
+                offset = (row * width + max(0, -xstart)) * 3
+                for col in range(max(0, -xstart), min(width, frame_width - xstart)):
+                    canvas.SetPixel(xstart + col, ystart + row, pixels[offset], pixels[offset + 1], pixels[offset + 2])
+                    offset += 3
+
 cdef class FrameCanvas(Canvas):
     def __dealloc__(self):
         if <void*>self.__canvas != NULL:
@@ -71,6 +89,33 @@ cdef class FrameCanvas(Canvas):
     def SetPixel(self, int x, int y, uint8_t red, uint8_t green, uint8_t blue):
         (<cppinc.FrameCanvas*>self._getCanvas()).SetPixel(x, y, red, green, blue)
 
+    def Serialize(self):
+        # Opaque, platform specific copy of the frame for Deserialize(); only
+        # valid for a canvas of a matrix with exactly the same settings.
+        cdef const char *data
+        cdef size_t length
+        (<cppinc.FrameCanvas*>self._getCanvas()).Serialize(&data, &length)
+        return data[:length]
+
+    @cython.boundscheck(False)
+    def Deserialize(self, const uint8_t[::1] data):
+        # Accepts bytes or any other contiguous buffer. Returns False if the
+        # size does not match this canvas. Only call on an off-screen canvas.
+        cdef cppinc.FrameCanvas *canvas = <cppinc.FrameCanvas*>self._getCanvas()
+        cdef size_t length = data.shape[0]
+        cdef bool ok
+        if length == 0:
+            return False
+        with nogil:
+            ok = canvas.Deserialize(<const char*>&data[0], length)
+        return ok
+
+    def CopyFrom(self, FrameCanvas other):
+        # Other must be a canvas created by the same RGBMatrix
+        cdef cppinc.FrameCanvas *canvas = <cppinc.FrameCanvas*>self._getCanvas()
+        cdef cppinc.FrameCanvas *source = <cppinc.FrameCanvas*>other._getCanvas()
+        with nogil:
+            canvas.CopyFrom(source[0])
 
     property width:
         def __get__(self): return (<cppinc.FrameCanvas*>self._getCanvas()).width()
@@ -253,7 +298,13 @@ cdef class RGBMatrix(Canvas):
     # If you combine this with RGBMatrixOptions.limit_refresh_rate_hz you can create
     # time-correct animations.
     def SwapOnVSync(self, FrameCanvas newFrame, uint8_t framerate_fraction = 1):
-        return __createFrameCanvas(self.__matrix.SwapOnVSync(newFrame.__canvas, framerate_fraction))
+        # Waiting for the vsync can take a whole refresh; let other Python
+        # threads (e.g. the feed poller) run meanwhile.
+        cdef cppinc.FrameCanvas *swapped
+        cdef cppinc.FrameCanvas *frame = newFrame.__canvas
+        with nogil:
+            swapped = self.__matrix.SwapOnVSync(frame, framerate_fraction)
+        return __createFrameCanvas(swapped)
 
     property luminanceCorrect:
         def __get__(self): return self.__matrix.luminance_correct()
@@ -22,13 +22,16 @@ cdef extern from "led-matrix.h" namespace "rgb_matrix":
         void SetBrightness(uint8_t)
         uint8_t brightness()
         FrameCanvas *CreateFrameCanvas()
-        FrameCanvas *SwapOnVSync(FrameCanvas*, uint8_t)
+        FrameCanvas *SwapOnVSync(FrameCanvas*, uint8_t) nogil
 
     cdef cppclass FrameCanvas(Canvas):
         bool SetPWMBits(uint8_t)
         uint8_t pwmbits()
         void SetBrightness(uint8_t)
         uint8_t brightness()
+        void Serialize(const char **, size_t *)
+        bool Deserialize(const char *, size_t) nogil
+        void CopyFrom(const FrameCanvas &) nogil
 
     struct RuntimeOptions:
       RuntimeOptions() except +
@@ -85,6 +88,9 @@ cdef extern from "graphics.h" namespace "rgb_matrix":
         int CharacterWidth(uint32_t)
         int DrawGlyph(Canvas*, int, int, const Color, uint32_t);
 
-    cdef int DrawText(Canvas*, const Font, int, int, const Color, const char*)
-    cdef void DrawCircle(Canvas*, int, int, int, const Color)
-    cdef void DrawLine(Canvas*, int, int, int, int, const Color)
+    cdef int DrawText(Canvas*, const Font, int, int, const Color, const char*) nogil
+    cdef void DrawCircle(Canvas*, int, int, int, const Color) nogil
+    cdef void DrawLine(Canvas*, int, int, int, int, const Color) nogil
+    cdef void FillRect(Canvas*, int, int, int, int, const Color) nogil
+    cdef void DrawRect(Canvas*, int, int, int, int, const Color) nogil
+    cdef void ClearRect(Canvas*, int, int, int, int) nogil
@@ -1,4 +1,6 @@
 # cython: language_level=3str
+from libc.stdint cimport uint8_t, uint32_t
+from libcpp.vector cimport vector
 from . cimport cppinc
 
 cdef class Color:
@@ -6,6 +8,29 @@ cdef class Color:
 
 cdef class Font:
     cdef cppinc.Font __font
+    # Advance of every ASCII glyph, filled in by LoadFont()
+    cdef int __asciiWidths[128]
+    cdef int __replacementWidth
+    cdef int __glyphWidth(self, uint32_t char)
+
+# One entry of a DrawList. Which fields are used depends on kind.
+cdef struct DrawCommand:
+    int kind
+    int x
+    int y
+    int x2
+    int y2
+    cppinc.Color color
+    const cppinc.Font *font
+    const char *text
+    const uint8_t *pixels
+
+cdef class DrawList:
+    cdef vector[DrawCommand] __commands
+    # Python objects (fonts, encoded text, pixel buffers) the commands point
+    # into, kept alive until Clear()
+    cdef list __references
+    cdef DrawCommand *__append(self, int kind, int x, int y, Color color)
 
 # Local Variables:
 # mode: python
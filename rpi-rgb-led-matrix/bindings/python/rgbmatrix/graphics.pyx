@@ -30,6 +30,30 @@ cdef class Font:
     def LoadFont(self, file):
         if (not self.__font.LoadFont(file.encode('utf-8'))):
             raise Exception("Couldn't load font " + file)
+        # DrawText() advances by the replacement glyph for missing characters
+        self.__replacementWidth = max(self.__font.CharacterWidth(0xFFFD), 0)
+        cdef int i
+        for i in range(128):
+            self.__asciiWidths[i] = self.__glyphWidth(i)
+
+    cdef int __glyphWidth(self, uint32_t char):
+        cdef int width = self.__font.CharacterWidth(char)
+        return width if width >= 0 else self.__replacementWidth
+
+    def TextWidth(self, text):
+        # Pixels DrawText() advances for text, without drawing it
+        cdef int width = 0
+        cdef uint32_t char
+        for c in text:
+            char = ord(c)
+            if char < 128:
+                width += self.__asciiWidths[char]
+            else:
+                width += self.__glyphWidth(char)
+        return width
+
+    property widths:
+        def __get__(self): return tuple(self.__asciiWidths[i] for i in range(128))
 
     def DrawGlyph(self, core.Canvas c, int x, int y, Color color, uint32_t char):
         return self.__font.DrawGlyph(c._getCanvas(), x, y, color.__color, char)
@@ -40,6 +64,123 @@ cdef class Font:
     property baseline:
         def __get__(self): return self.__font.baseline()
 
+cdef enum:
+    COMMAND_TEXT
+    COMMAND_LINE
+    COMMAND_CIRCLE
+    COMMAND_RECT
+    COMMAND_PIXELS
+
+# Font and Color keep their C++ objects in private attributes; reach them
+# from outside a class body so the names are not mangled.
+cdef const cppinc.Font *_fontOf(Font f):
+    return &f.__font
+
+cdef cppinc.Color _colorOf(Color c):
+    return c.__color
+
+cdef class DrawList:
+    # A reusable list of drawing commands. Build a frame with the Draw*
+    # methods, then Draw(canvas) runs the whole list natively with the GIL
+    # released: one Python call per frame instead of one per primitive.
+    # Clear() empties the list but keeps its memory for the next frame.
+    def __cinit__(self):
+        self.__references = []
+
+    def __len__(self):
+        return self.__commands.size()
+
+    def Clear(self):
+        self.__commands.clear()
+        self.__references = []
+
+    cdef DrawCommand *__append(self, int kind, int x, int y, Color color):
+        cdef DrawCommand command
+        command.kind = kind
+        command.x = x
+        command.y = y
+        command.x2 = 0
+        command.y2 = 0
+        if color is not None:
+            command.color = _colorOf(color)
+        else:
+            command.color.r = command.color.g = command.color.b = 0
+        command.font = NULL
+        command.text = NULL
+        command.pixels = NULL
+        self.__commands.push_back(command)
+        return &self.__commands.back()
+
+    def DrawText(self, Font f, int x, int y, Color color, text):
+        encoded = text.encode('utf-8')
+        self.__references.append(f)
+        self.__references.append(encoded)
+        cdef DrawCommand *command = self.__append(COMMAND_TEXT, x, y, color)
+        command.font = _fontOf(f)
+        command.text = encoded
+
+    def DrawLine(self, int x1, int y1, int x2, int y2, Color color):
+        cdef DrawCommand *command = self.__append(COMMAND_LINE, x1, y1, color)
+        command.x2 = x2
+        command.y2 = y2
+
+    def DrawCircle(self, int x, int y, int r, Color color):
+        cdef DrawCommand *command = self.__append(COMMAND_CIRCLE, x, y, color)
+        command.x2 = r
+
+    def FillRect(self, int x, int y, int width, int height, Color color):
+        cdef DrawCommand *command = self.__append(COMMAND_RECT, x, y, color)
+        command.x2 = width
+        command.y2 = height
+
+    def SetPixels(self, int x, int y, int width, int height, buf):
+        # Packed 8-bit RGB from any C-contiguous buffer, as for
+        # Canvas.SetPixelsFromBuffer(). The buffer is not copied, so it must
+        # not change before Draw().
+        view = memoryview(buf)
+        if view.itemsize != 1:
+            raise ValueError("SetPixels() needs a buffer of bytes, e.g. a uint8 array")
+        if width <= 0 or height <= 0 or view.nbytes < width * height * 3:
+            raise ValueError("Buffer is smaller than width * height * 3")
+        cdef const uint8_t[::1] pixels = view.cast('B') if view.ndim != 1 or view.format != 'B' else view
+        self.__references.append(pixels)
+        cdef DrawCommand *command = self.__append(COMMAND_PIXELS, x, y, None)
+        command.x2 = width
+        command.y2 = height
+        command.pixels = &pixels[0]
+
+    def SetImage(self, image, int x = 0, int y = 0):
+        if (image.mode != "RGB"):
+            raise Exception("Only RGB images can be added to a DrawList")
+        width, height = image.size
+        self.SetPixels(x, y, width, height, image.tobytes())
+
+    def Draw(self, core.Canvas c):
+        cdef cppinc.Canvas *canvas = c._getCanvas()
+        cdef int canvasWidth = canvas.width()
+        cdef int canvasHeight = canvas.height()
+        cdef size_t i
+        cdef int row, col, offset
+        cdef const DrawCommand *command
+        with nogil:
+            for i in range(self.__commands.size()):
+                command = &self.__commands[i]
+                if command.kind == COMMAND_TEXT:
+                    cppinc.DrawText(canvas, command.font[0], command.x, command.y, command.color, command.text)
+                elif command.kind == COMMAND_LINE:
+                    cppinc.DrawLine(canvas, command.x, command.y, command.x2, command.y2, command.color)
+                elif command.kind == COMMAND_CIRCLE:
+                    cppinc.DrawCircle(canvas, command.x, command.y, command.x2, command.color)
+                elif command.kind == COMMAND_RECT:
+                    cppinc.FillRect(canvas, command.x, command.y, command.x2, command.y2, command.color)
+                elif command.kind == COMMAND_PIXELS:
+                    for row in range(max(0, -command.y), min(command.y2, canvasHeight - command.y)):
+                        offset = (row * command.x2 + max(0, -command.x)) * 3
+                        for col in range(max(0, -command.x), min(command.x2, canvasWidth - command.x)):
+                            canvas.SetPixel(command.x + col, command.y + row,
+                                            command.pixels[offset], command.pixels[offset + 1], command.pixels[offset + 2])
+                            offset += 3
+
 def DrawText(core.Canvas c, Font f, int x, int y, Color color, text):
     return cppinc.DrawText(c._getCanvas(), f.__font, x, y, color.__color, text.encode('utf-8'))
 
@@ -49,6 +190,15 @@ def DrawCircle(core.Canvas c, int x, int y, int r, Color color):
 def DrawLine(core.Canvas c, int x1, int y1, int x2, int y2, Color color):
     cppinc.DrawLine(c._getCanvas(), x1, y1, x2, y2, color.__color)
 
+def FillRect(core.Canvas c, int x, int y, int width, int height, Color color):
+    cppinc.FillRect(c._getCanvas(), x, y, width, height, color.__color)
+
+def DrawRect(core.Canvas c, int x, int y, int width, int height, Color color):
+    cppinc.DrawRect(c._getCanvas(), x, y, width, height, color.__color)
+
+def ClearRect(core.Canvas c, int x, int y, int width, int height):
+    cppinc.ClearRect(c._getCanvas(), x, y, width, height)
+
 # Local Variables:
 # mode: python
 # End:
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# Compares filling rectangles with one DrawLine() per row against the native
+# FillRect()/ClearRect(). On the pylon (64x32 panels, chain of 16):
+#   sudo ./rect-benchmark.py --led-rows=64 --led-cols=32 --led-chain=16
+import time
+from samplebase import SampleBase
+from rgbmatrix import graphics
+
+
+class RectBenchmark(SampleBase):
+    def __init__(self, *args, **kwargs):
+        super(RectBenchmark, self).__init__(*args, **kwargs)
+        self.parser.add_argument("--iterations", type=int, default=200, help="Fills per measurement. Default: 200")
+
+    def measure(self, name, iterations, fill):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fill()
+        elapsed = (time.perf_counter() - start) / iterations
+        print("%-28s %8.3f ms" % (name, elapsed * 1000))
+        return elapsed
+
+    def run(self):
+        canvas = self.matrix.CreateFrameCanvas()
+        width = canvas.width
+        height = canvas.height
+        iterations = self.args.iterations
+        color = graphics.Color(0, 255, 0)
+        print("Canvas %dx%d, %d iterations" % (width, height, iterations))
+
+        def header_lines():
+            for y in range(14):
+                graphics.DrawLine(canvas, 0, y, width - 1, y, color)
+
+        def header_rect():
+            graphics.FillRect(canvas, 0, 0, width, 14, color)
+
+        def board_lines():
+            for y in range(height):
+                graphics.DrawLine(canvas, 0, y, width - 1, y, color)
+
+        def board_rect():
+            graphics.FillRect(canvas, 0, 0, width, height, color)
+
+        def rows_lines():
+            # Clearing 16px leaderboard rows one line at a time, as the
+            # scrolling code used to
+            for top in range(16, height - 16, 16):
+                for y in range(top, top + 16):
+                    graphics.DrawLine(canvas, 0, y, width - 1, y, graphics.Color(0, 0, 0))
+
+        def rows_rect():
+            for top in range(16, height - 16, 16):
+                graphics.ClearRect(canvas, 0, top, width, 16)
+
+        for name, lines, rect in (("header band (14 rows)", header_lines, header_rect),
+                                  ("whole board", board_lines, board_rect),
+                                  ("leaderboard rows", rows_lines, rows_rect)):
+            by_lines = self.measure(name + ", DrawLine", iterations, lines)
+            by_rect = self.measure(name + ", FillRect", iterations, rect)
+            print("%-28s %8.1fx" % ("", by_lines / by_rect if by_rect else 0))
+
+        canvas = self.matrix.SwapOnVSync(canvas)
+
+
+# Main function
+if __name__ == "__main__":
+    rect_benchmark = RectBenchmark()
+    if (not rect_benchmark.process()):
+        rect_benchmark.print_help()
@@ -1,39 +1,140 @@
+import json
+import threading
 from LiveFeed import LiveFeed
 from OpsFeed import OpsFeed
-from Series import Series
-import requests
+from OpsFeedCache import OpsFeedCache
+from PointsFeed import PointsFeed
+from FeedTransport import FeedTransport
+from FeedParser import FeedParser
+from FeedUnavailable import FeedUnavailable
+from UnexpectedFeed import UnexpectedFeed
 
 class ApiClient:
-    def __init__(self):
-        self.current_ops = self.getOpsFeed()
+    def __init__(self, transport=None, parser=None, opsCachePath=OpsFeedCache.DEFAULT_PATH, opsFeedUrl=None):
+        # opsFeedUrl points the client somewhere other than NASCAR, e.g. a FeedHub
+        self.opsFeedUrl = opsFeedUrl
+        self.transport = transport or FeedTransport()
+        self.parser = parser or FeedParser()
+        # url -> last LiveFeed built from a 200, reused when the server says 304
+        self.liveFeeds = {}
+        self.pointsFeeds = {}
+        self.opsCache = OpsFeedCache(opsCachePath) if opsCachePath else None
+        self.opsRefresh = None
+        self.current_ops = None
+
+        # Start from the cached ops feed if there is one and only hit the
+        # network before the first frame when we have nothing at all.
+        if self.opsCache is not None:
+            self.current_ops = self.__cachedOpsFeed()
+        if self.current_ops is None:
+            self.current_ops = self.getOpsFeed()
+        elif self.opsCache.isDue():
+            self.refreshOpsFeedInBackground()
     
     def __opsFeedUrl(self):
-        return 'https://cf.nascar.com/live-ops/live-ops.json'
+        return self.opsFeedUrl or 'https://cf.nascar.com/live-ops/live-ops.json'
 
-    def getData(self, specUrl):
-        r = requests.get(specUrl)
+    def __cachedOpsFeed(self):
+        data = self.opsCache.load(self.__opsFeedUrl())
+        if data is None:
+            return None
         try:
-            data = r.json()
-        except:
-            data={}
-        return data
-    
+            feed = OpsFeed(data)
+        except KeyError:
+            return None
+        etag, lastModified = self.opsCache.validators
+        if etag or lastModified:
+            self.transport.validators[self.__opsFeedUrl()] = (etag, lastModified)
+        return feed
+
+    def getData(self, specUrl, parse=None):
+        try:
+            return self.transport.get(specUrl, parse)
+        except OSError as e:
+            # requests' exceptions are OSErrors: timeouts, resets, DNS
+            raise FeedUnavailable(f'{specUrl}: {e}') from e
+
+    def __getLiveData(self, seriesUrl):
+        try:
+            return self.getData(seriesUrl, self.parser.parseLiveFeed)
+        except UnexpectedFeed:
+            # The selective parse gave up; fetch it again and parse it whole
+            self.transport.forget(seriesUrl)
+            return self.getData(seriesUrl, json.load)
+
     def getLiveFeed(self, series):
-        match series:
-            case Series.CUP:
-                seriesUrl = self.current_ops.cupLiveFeedUrl
-            case Series.XFINITY:
-                seriesUrl = self.current_ops.xfinityLiveFeedUrl
-            case Series.TRUCKS:
-                seriesUrl = self.current_ops.trucksLiveFeedUrl
-            case _:
-                raise Exception("Series not found")
-        
-        data = self.getData(seriesUrl)
-        feed = LiveFeed(data)
+        if self.opsCache is not None and self.opsCache.isDue():
+            self.refreshOpsFeedInBackground()
+
+        seriesUrl = self.current_ops.liveFeedUrl(series)
+        if seriesUrl is None:
+            raise Exception("Series not found")
+
+        data = self.__getLiveData(seriesUrl)
+        if data is None:
+            feed = self.liveFeeds.get(seriesUrl)
+            if feed is not None:
+                return feed
+            # 304 for something we never managed to parse; ask again unconditionally
+            self.transport.forget(seriesUrl)
+            data = self.__getLiveData(seriesUrl)
+        # Build the whole feed before replacing the cached one, so a bad body
+        # never takes the place of the last good feed.
+        try:
+            if not data:
+                raise ValueError('empty or non-JSON body')
+            feed = LiveFeed(data)
+        except (KeyError, TypeError, ValueError) as e:
+            self.transport.forget(seriesUrl)
+            raise FeedUnavailable(f'{seriesUrl}: bad live feed ({e!r})') from e
+        self.liveFeeds[seriesUrl] = feed
         return feed
     
+    def getPointsFeed(self, series):
+        seriesUrl = self.current_ops.pointsFeedUrl(series)
+        if seriesUrl is None:
+            raise Exception("Series not found")
+
+        data = self.getData(seriesUrl)
+        if data is None:
+            feed = self.pointsFeeds.get(seriesUrl)
+            if feed is not None:
+                return feed
+            self.transport.forget(seriesUrl)
+            data = self.getData(seriesUrl)
+        if not isinstance(data, list):
+            self.transport.forget(seriesUrl)
+            raise FeedUnavailable(f'{seriesUrl}: bad points feed')
+        feed = PointsFeed(data)
+        self.pointsFeeds[seriesUrl] = feed
+        return feed
+
     def getOpsFeed(self):
-        data = self.getData(self.__opsFeedUrl())
+        opsUrl = self.__opsFeedUrl()
+        data = self.getData(opsUrl)
+        if data is None:
+            if self.opsCache is not None:
+                self.opsCache.touch()
+            return self.current_ops
+        # OpsFeed raises on a broken body before anything gets cached
         feed = OpsFeed(data)
+        if self.opsCache is not None:
+            self.opsCache.save(opsUrl, data, self.transport.validators.get(opsUrl))
         return feed
+
+    def refreshOpsFeedInBackground(self):
+        if self.opsRefresh is not None and self.opsRefresh.is_alive():
+            return
+        self.opsCache.attempted()
+        self.opsRefresh = threading.Thread(target=self.__refreshOpsFeed, name='OpsFeedRefresh', daemon=True)
+        self.opsRefresh.start()
+
+    def __refreshOpsFeed(self):
+        try:
+            self.current_ops = self.getOpsFeed()
+        except Exception:
+            # Keep rendering with the last known URLs; isDue() retries later.
+            pass
+
+    def stats(self):
+        return self.transport.stats()
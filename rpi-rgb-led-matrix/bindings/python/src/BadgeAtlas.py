@@ -0,0 +1,86 @@
+import json
+import mmap
+import os
+import struct
+from PIL import Image
+
+# Every badge of one badge directory, pre-resized, in a single file:
+#
+#   b'PYLBADG1' <uint32 little-endian n>
+#   <n bytes of JSON index>
+#   <raw RGB pixels, 3 bytes per pixel, row-major>
+#
+# The index is {"mtime": <badge directory mtime when packed>,
+#               "badges": {"<car>": {"<w>x<h>": <offset>, ...}, ...}}
+# with offsets counted from the start of the file. The loader maps the file
+# and slices pixels straight out of it: one open per series, no decoding.
+class BadgeAtlas:
+    MAGIC = b'PYLBADG1'
+    HEADER = struct.Struct('<8sI')
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, indexSize = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC:
+            self.map.close()
+            raise ValueError(f'{path} is not a badge atlas')
+        index = json.loads(self.map[self.HEADER.size:self.HEADER.size + indexSize])
+        self.mtime = index['mtime']
+        self.badges = index['badges']
+
+    def __contains__(self, vehicleNumber):
+        return vehicleNumber in self.badges
+
+    def get(self, vehicleNumber, size):
+        # RGB Image of the badge at size, or None if it was not packed at that size
+        offset = self.badges.get(vehicleNumber, {}).get(f'{size[0]}x{size[1]}')
+        if offset is None:
+            return None
+        length = size[0] * size[1] * 3
+        return Image.frombytes('RGB', size, self.map[offset:offset + length])
+
+    def close(self):
+        self.map.close()
+
+    @staticmethod
+    def pack(directory, path, sizes, resample=Image.LANCZOS):
+        # Packs every <car>.png in directory at each size. Written to a temp
+        # file and renamed so a running sign never maps half an atlas.
+        mtime = os.stat(directory).st_mtime
+        images = []
+        for name in sorted(os.listdir(directory)):
+            vehicleNumber, extension = os.path.splitext(name)
+            if extension.lower() != '.png':
+                continue
+            try:
+                with Image.open(os.path.join(directory, name)) as image:
+                    image = image.convert('RGB')
+                    for size in sizes:
+                        images.append((vehicleNumber, size, image.resize(size, resample).tobytes()))
+            except (IOError, ValueError):
+                continue
+
+        # Offsets depend on the index length and the index holds the offsets,
+        # so lay the pixels out first and fix the index size up until stable.
+        indexSize = 0
+        while True:
+            badges = {}
+            offset = BadgeAtlas.HEADER.size + indexSize
+            for vehicleNumber, size, pixels in images:
+                badges.setdefault(vehicleNumber, {})[f'{size[0]}x{size[1]}'] = offset
+                offset += len(pixels)
+            index = json.dumps({'mtime': mtime, 'badges': badges}, separators=(',', ':')).encode('utf-8')
+            if len(index) == indexSize:
+                break
+            indexSize = len(index)
+
+        temp = path + '.tmp'
+        with open(temp, 'wb') as f:
+            f.write(BadgeAtlas.HEADER.pack(BadgeAtlas.MAGIC, len(index)))
+            f.write(index)
+            for vehicleNumber, size, pixels in images:
+                f.write(pixels)
+        os.replace(temp, path)
+        return len(badges)
@@ -0,0 +1,118 @@
+import os
+import time
+from PIL import Image
+from BadgeAtlas import BadgeAtlas
+
+# Car number badges, decoded and resized once instead of every frame.
+#
+# Keyed by (badge directory, car number, size). Cars without a badge are
+# remembered too so the SD card is not searched for them again. Each badge
+# directory's mtime is checked every checkInterval seconds; when a badge is
+# added, removed or replaced by rename (a plain overwrite in place does not
+# touch the directory), that directory's entries are dropped and its
+# generation goes up, so anything built from its badges knows to rebuild.
+#
+# If pack-badges.py has written <badge directory>.atlas next to a directory
+# and the directory has not changed since, badges come out of the mapped
+# atlas instead of being decoded from PNGs.
+class BadgeCache:
+    DEFAULT_PATH = '/home/tonicinnovations/badges'
+
+    def __init__(self, basePath=DEFAULT_PATH, size=(16, 16), checkInterval=5):
+        self.basePath = basePath
+        self.size = size
+        self.checkInterval = checkInterval
+        # (badgeDir, vehicleNumber, size) -> RGB Image, or None for "no badge"
+        self.images = {}
+        # badgeDir -> (mtime, monotonic time it was last checked)
+        self.directories = {}
+        self.generations = {}
+        # badgeDir -> BadgeAtlas, or None if there is no usable atlas
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def get(self, badgeDir, vehicleNumber, size=None):
+        # Ready-to-blit badge for a car, or None if it has no badge.
+        size = size or self.size
+        self.__checkDirectory(badgeDir)
+        key = (badgeDir, vehicleNumber, size)
+        try:
+            image = self.images[key]
+            self.hits += 1
+            return image
+        except KeyError:
+            pass
+        self.misses += 1
+        image = self.__load(badgeDir, vehicleNumber, size)
+        self.images[key] = image
+        return image
+
+    def generation(self, badgeDir):
+        self.__checkDirectory(badgeDir)
+        return self.generations.get(badgeDir, 0)
+
+    def __load(self, badgeDir, vehicleNumber, size):
+        atlas = self.__atlas(badgeDir)
+        if atlas is not None:
+            if vehicleNumber not in atlas:
+                return None
+            image = atlas.get(vehicleNumber, size)
+            if image is not None:
+                return image
+        path = os.path.join(self.basePath, badgeDir, f'{vehicleNumber}.png')
+        self.loads += 1
+        try:
+            with Image.open(path) as image:
+                return image.convert('RGB').resize(size, Image.LANCZOS)
+        except (IOError, ValueError):
+            return None
+
+    def __atlas(self, badgeDir):
+        if badgeDir in self.atlases:
+            return self.atlases[badgeDir]
+        atlas = None
+        try:
+            atlas = BadgeAtlas(os.path.join(self.basePath, badgeDir or 'badges') + '.atlas')
+            # Packed before the last badge upload: the PNGs are the truth
+            if atlas.mtime != self.directories.get(badgeDir, (None,))[0]:
+                atlas.close()
+                atlas = None
+        except (OSError, ValueError, KeyError):
+            atlas = None
+        self.atlases[badgeDir] = atlas
+        return atlas
+
+    def __checkDirectory(self, badgeDir):
+        now = time.monotonic()
+        known = self.directories.get(badgeDir)
+        if known is not None and now - known[1] < self.checkInterval:
+            return
+        try:
+            mtime = os.stat(os.path.join(self.basePath, badgeDir)).st_mtime
+        except OSError:
+            mtime = None
+        if known is not None and known[0] != mtime:
+            self.invalidate(badgeDir)
+        self.directories[badgeDir] = (mtime, now)
+
+    def invalidate(self, badgeDir=None):
+        for key in [key for key in self.images if badgeDir is None or key[0] == badgeDir]:
+            del self.images[key]
+        for directory in [directory for directory in self.atlases if badgeDir is None or directory == badgeDir]:
+            if self.atlases[directory] is not None:
+                self.atlases[directory].close()
+            del self.atlases[directory]
+        for directory in ([badgeDir] if badgeDir is not None else set(self.generations) | set(self.directories)):
+            self.generations[directory] = self.generations.get(directory, 0) + 1
+
+    def stats(self):
+        lookups = (self.hits + self.misses) or 1
+        return {
+            'entries': len(self.images),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups,
+            'loads': self.loads,
+        }
@@ -0,0 +1,78 @@
+# Pure-Python reader for the same .bdf fonts the matrix library loads, for
+# drawing text into PIL images off the canvas. Parsing and glyph placement
+# follow lib/bdf-font.cc so text comes out pixel-identical to DrawText().
+class BdfFont:
+    REPLACEMENT = 0xFFFD
+
+    def __init__(self, path):
+        self.height = -1
+        self.baseline = 0
+        # codepoint -> (deviceWidth, yOffset, rows), rows being the x offsets
+        # of the lit pixels in each bitmap row
+        self.glyphs = {}
+        self.__load(path)
+
+    def __load(self, path):
+        codepoint = None
+        deviceWidth = 0
+        glyph = None
+        rows = None
+        with open(path, encoding='latin-1') as f:
+            for line in f:
+                fields = line.split()
+                if not fields:
+                    continue
+                keyword = fields[0]
+                if keyword == 'FONTBOUNDINGBOX':
+                    self.height = int(fields[2])
+                    self.baseline = int(fields[4]) + self.height
+                elif keyword == 'ENCODING':
+                    codepoint = int(fields[1])
+                elif keyword == 'DWIDTH':
+                    deviceWidth = int(fields[1])
+                elif keyword == 'BBX':
+                    glyph = (deviceWidth, int(fields[2]), int(fields[4]))
+                    rows = None
+                elif keyword == 'BITMAP':
+                    rows = []
+                elif keyword == 'ENDCHAR':
+                    if glyph is not None and rows is not None and len(rows) == glyph[1]:
+                        self.glyphs[codepoint] = (glyph[0], glyph[2], rows)
+                    glyph = None
+                    rows = None
+                elif rows is not None and glyph is not None and len(rows) < glyph[1]:
+                    bits = len(keyword) * 4
+                    value = int(keyword, 16)
+                    rows.append(tuple(x for x in range(min(bits, glyph[0])) if value >> (bits - 1 - x) & 1))
+
+    def glyph(self, codepoint):
+        return self.glyphs.get(codepoint) or self.glyphs.get(self.REPLACEMENT)
+
+    def textWidth(self, text):
+        width = 0
+        for character in text:
+            glyph = self.glyph(ord(character))
+            if glyph is not None:
+                width += glyph[0]
+        return width
+
+    def drawText(self, pixels, size, x, y, color, text):
+        # Draws into a PIL pixel access object (image.load()) with y as the
+        # baseline, clipped to size. Returns how far x advanced.
+        width, height = size
+        start = x
+        for character in text:
+            glyph = self.glyph(ord(character))
+            if glyph is None:
+                continue
+            deviceWidth, yOffset, rows = glyph
+            top = y - len(rows) - yOffset
+            for row, lit in enumerate(rows):
+                py = top + row
+                if 0 <= py < height:
+                    for offset in lit:
+                        px = x + offset
+                        if 0 <= px < width:
+                            pixels[px, py] = color
+            x += deviceWidth
+        return x - start
@@ -0,0 +1,78 @@
+# Change set between two consecutive LiveFeed snapshots. Each list/dict stays
+# the shared empty NO_CHANGES until something actually lands in it, so a diff
+# of an unchanged feed allocates nothing but the FeedDiff itself.
+NO_CHANGES = ()
+
+class FeedDiff:
+    __slots__ = ('previous', 'current', 'flagChanged', 'lapChanged', 'lapsToGoChanged',
+                 'moves', 'pitIn', 'pitOut', 'added', 'retired')
+
+    def __init__(self, previous, current):
+        self.previous = previous
+        self.current = current
+        # vehicleNumber -> (oldPosition, newPosition), positions are 1-based
+        self.moves = NO_CHANGES
+        self.pitIn = NO_CHANGES
+        self.pitOut = NO_CHANGES
+        self.added = NO_CHANGES
+        self.retired = NO_CHANGES
+
+        if previous is None:
+            self.flagChanged = self.lapChanged = self.lapsToGoChanged = True
+            return
+        self.flagChanged = previous.flagStatus != current.flagStatus
+        self.lapChanged = previous.lapNumber != current.lapNumber
+        self.lapsToGoChanged = previous.lapsToGo != current.lapsToGo
+        if previous is current:
+            return
+
+        previousIndex = previous.vehicleIndex()
+        position = 0
+        for vehicle in current.vehicles:
+            position += 1
+            number = vehicle.vehicleNumber
+            old = previousIndex.get(number)
+            if old is None:
+                if self.added is NO_CHANGES:
+                    self.added = []
+                self.added.append(number)
+                continue
+            oldPosition, oldVehicle = old
+            if oldPosition != position:
+                if self.moves is NO_CHANGES:
+                    self.moves = {}
+                self.moves[number] = (oldPosition, position)
+            pitStopCount = vehicle.pitStopCount
+            if pitStopCount > oldVehicle.pitStopCount:
+                if self.pitIn is NO_CHANGES:
+                    self.pitIn = []
+                self.pitIn.append(number)
+            elif vehicle.lastPitOutElapsedTime and not oldVehicle.lastPitOutElapsedTime:
+                if self.pitOut is NO_CHANGES:
+                    self.pitOut = []
+                self.pitOut.append(number)
+            if oldVehicle.isOnTrack and not vehicle.isOnTrack:
+                if self.retired is NO_CHANGES:
+                    self.retired = []
+                self.retired.append(number)
+
+        # Cars in the previous feed that we did not walk past above have
+        # dropped out of the feed entirely.
+        if len(previousIndex) > len(current.vehicles) - len(self.added):
+            currentIndex = current.vehicleIndex()
+            for number in previousIndex:
+                if number not in currentIndex:
+                    if self.retired is NO_CHANGES:
+                        self.retired = []
+                    self.retired.append(number)
+
+    def isEmpty(self):
+        return not (self.flagChanged or self.lapChanged or self.lapsToGoChanged or self.moves
+                    or self.pitIn or self.pitOut or self.added or self.retired)
+
+    def movement(self, vehicleNumber):
+        # > 0 gained positions, < 0 lost positions, 0 unchanged
+        move = self.moves.get(vehicleNumber) if self.moves else None
+        if move is None:
+            return 0
+        return move[0] - move[1]
@@ -0,0 +1,170 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from LiveFeed import LiveFeed
+from MultiSeriesFetcher import MultiSeriesFetcher
+from PollScheduler import PollScheduler
+from Series import Series
+
+# Polls upstream once and serves the result to every pylon at the venue.
+#
+# The hub publishes its own live-ops.json whose live feed URLs point back at
+# the hub, so a pylon only needs ApiClient(opsFeedUrl='http://hub:8080/live-ops.json').
+# Each published body carries a sequence number, prefixed in its ETag with
+# the hub's start time so a restarted hub never matches an old ETag: a pylon
+# that already has the latest one gets a 304, or, with ?wait=N, is held for
+# up to N seconds until the next one arrives (long-poll).
+class FeedHub:
+    def __init__(self, client, seriesList=(Series.CUP,), port=8080, longPoll=3, interval=None):
+        self.client = client
+        self.seriesList = tuple(seriesList)
+        self.port = port
+        self.longPoll = longPoll
+        self.interval = interval
+        self.scheduler = PollScheduler()
+        self.fetcher = MultiSeriesFetcher(client)
+        self.sequence = 0
+        # Sequences restart with the hub; the epoch keeps ETags unique anyway
+        self.epoch = int(time.time() * 1000)
+        # series.value -> (sequence, fetchedAt, body, gzippedBody)
+        self.published = {}
+        self.changed = threading.Condition()
+        self.server = None
+        self.__stopped = threading.Event()
+
+    def start(self):
+        hub = self
+
+        class Handler(FeedHubHandler):
+            pass
+        Handler.hub = hub
+
+        self.server = ThreadingHTTPServer(('', self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name='FeedHubServer', daemon=True).start()
+        threading.Thread(target=self.run, name='FeedHubPoller', daemon=True).start()
+
+    def stop(self):
+        self.__stopped.set()
+        if self.server is not None:
+            self.server.shutdown()
+
+    def run(self):
+        while not self.__stopped.is_set():
+            self.poll()
+            self.__stopped.wait(self.interval if self.interval is not None else self.scheduler.nextInterval())
+
+    def poll(self):
+        results = self.fetcher.fetchAll(self.seriesList, self.__fetchRaw)
+        first = results.get(self.seriesList[0])
+        if isinstance(first, Exception):
+            self.scheduler.failed()
+        elif first is None:
+            # 304: upstream is fine, just unchanged, so drop any backoff
+            self.scheduler.succeeded()
+        for series, result in results.items():
+            if isinstance(result, Exception) or result is None:
+                continue
+            data, feed = result
+            if series == self.seriesList[0]:
+                self.scheduler.observe(feed)
+            self.publish(series, data)
+
+    def __fetchRaw(self, series):
+        # Raw upstream dict (the hub forwards bodies, not LiveFeed objects), or
+        # None when upstream answered 304.
+        url = self.client.current_ops.liveFeedUrl(series)
+        if url is None:
+            raise Exception("Series not found")
+        data = self.client.getData(url)
+        if data is None:
+            return None
+        # Never forward anything a pylon could not turn into a LiveFeed
+        return data, LiveFeed(data)
+
+    def publish(self, series, data):
+        body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        with self.changed:
+            self.sequence += 1
+            self.published[series.value] = (self.sequence, time.time(), body, gzip.compress(body, 6))
+            self.changed.notify_all()
+
+    def waitForChange(self, seriesValue, sequence, timeout):
+        deadline = time.monotonic() + timeout
+        with self.changed:
+            while True:
+                current = self.published.get(seriesValue)
+                if current is not None and current[0] != sequence:
+                    return current
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return current
+                self.changed.wait(remaining)
+
+    def opsFeed(self, host):
+        base = f'http://{host}'
+        ops = {}
+        for series in Series:
+            ops[f'live_feed_url_series{series.value}'] = f'{base}/live/{series.value}?wait={self.longPoll}'
+            # Points change a few times a race; pylons fetch those from upstream directly.
+            ops[f'driver_points_feed_url_series{series.value}'] = self.client.current_ops.pointsFeedUrl(series)
+        return ops
+
+class FeedHubHandler(BaseHTTPRequestHandler):
+    hub = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/live-ops.json':
+            host = self.headers.get('Host') or f'{self.server.server_address[0]}:{self.hub.port}'
+            self.__send(200, json.dumps(self.hub.opsFeed(host)).encode('utf-8'))
+            return
+        if not url.path.startswith('/live/'):
+            self.__send(404, b'{}')
+            return
+        try:
+            seriesValue = int(url.path[len('/live/'):])
+            wait = min(float(parse_qs(url.query).get('wait', ['0'])[0]), 30)
+        except ValueError:
+            self.__send(400, b'{}')
+            return
+
+        epoch, _, known = self.headers.get('If-None-Match', '').strip('"').partition('-')
+        known = int(known) if epoch == str(self.hub.epoch) and known.isdigit() else None
+        current = self.hub.published.get(seriesValue)
+        if current is not None and current[0] == known and wait > 0:
+            current = self.hub.waitForChange(seriesValue, known, wait)
+        if current is None:
+            self.__send(503, b'{}')
+            return
+
+        sequence, fetchedAt, body, gzippedBody = current
+        headers = {'ETag': f'"{self.hub.epoch}-{sequence}"', 'X-Feed-Sequence': str(sequence), 'X-Feed-Fetched-At': f'{fetchedAt:.3f}'}
+        if sequence == known:
+            self.__send(304, None, headers)
+        elif 'gzip' in self.headers.get('Accept-Encoding', ''):
+            headers['Content-Encoding'] = 'gzip'
+            self.__send(200, gzippedBody, headers)
+        else:
+            self.__send(200, body, headers)
+
+    def __send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        else:
+            self.send_header('Content-Length', '0')
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
@@ -0,0 +1,98 @@
+import json
+from UnexpectedFeed import UnexpectedFeed
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# What LiveFeed, Vehicle and PitStop actually read. Everything else in the
+# live feed (driver bios, laps led, stage info, ...) is skipped while parsing.
+FEED_FIELDS = ('lap_number', 'flag_state', 'laps_in_race', 'laps_to_go')
+VEHICLE_FIELDS = ('vehicle_number', 'laps_completed', 'passing_differential', 'status',
+                  'is_on_dvp', 'is_on_track', 'last_lap_time')
+PITSTOP_FIELDS = ('pit_in_leader_lap', 'pit_out_elapsed_time')
+
+# Keys LiveFeed/Vehicle/PitStop index directly; if any is missing the stream
+# did not look like a live feed and the caller has to fetch it again for a
+# full parse (see UnexpectedFeed).
+REQUIRED_VEHICLE_FIELDS = ('vehicle_number', 'laps_completed', 'passing_differential', 'status',
+                           'is_on_dvp', 'is_on_track')
+
+class FeedParser:
+    # Selective parsing is off by default: ijson hands every event back to
+    # Python, which on bench-feed-parse.py is slower than the C json module
+    # building the whole document and peaks at more memory too. It is kept
+    # as the baseline that benchmark measures against.
+    def __init__(self, selective=False, feedFields=FEED_FIELDS, vehicleFields=VEHICLE_FIELDS, pitStopFields=PITSTOP_FIELDS):
+        self.feedFields = frozenset(feedFields)
+        self.vehicleFields = frozenset(vehicleFields)
+        self.pitStopFields = frozenset(pitStopFields)
+        self.selective = selective and ijson is not None
+        self.fallbackCount = 0
+
+    def parseLiveFeed(self, stream):
+        if not self.selective:
+            return json.load(stream)
+
+        try:
+            data = self.__extract(stream)
+        except ijson.JSONError as e:
+            # Broken or truncated body, same as json.load() failing on it
+            raise ValueError(str(e)) from e
+        if not self.__looksComplete(data):
+            # The body has been consumed and not kept; the caller refetches
+            self.fallbackCount += 1
+            raise UnexpectedFeed('live feed is missing fields the selective parse needs')
+        return data
+
+    def __extract(self, stream):
+        feed = {}
+        vehicles = []
+        vehicle = None
+        pitStops = None
+        pitStop = None
+        feedFields = self.feedFields
+        vehicleFields = self.vehicleFields
+        pitStopFields = self.pitStopFields
+
+        for prefix, event, value in ijson.parse(stream, use_float=True):
+            if prefix.startswith('vehicles.item'):
+                if prefix == 'vehicles.item':
+                    if event == 'start_map':
+                        vehicle = {}
+                        pitStops = None
+                    elif event == 'end_map':
+                        vehicles.append(vehicle)
+                    continue
+                field = prefix[14:]
+                if field in vehicleFields:
+                    vehicle[field] = value
+                elif field == 'pit_stops':
+                    if event == 'start_array':
+                        pitStops = vehicle['pit_stops'] = []
+                elif field == 'pit_stops.item':
+                    if event == 'start_map':
+                        pitStop = {}
+                    elif event == 'end_map':
+                        pitStops.append(pitStop)
+                elif field.startswith('pit_stops.item.'):
+                    if field[15:] in pitStopFields:
+                        pitStop[field[15:]] = value
+            elif prefix in feedFields:
+                feed[prefix] = value
+
+        feed['vehicles'] = vehicles
+        return feed
+
+    def __looksComplete(self, data):
+        for field in self.feedFields:
+            if field not in data:
+                return False
+        for vehicle in data['vehicles']:
+            if 'pit_stops' not in vehicle:
+                return False
+            for field in REQUIRED_VEHICLE_FIELDS:
+                if field not in vehicle:
+                    return False
+        return True
@@ -0,0 +1,162 @@
+import threading
+import time
+from ApiClient import ApiClient
+from FeedTransport import FeedTransport
+from FeedSnapshot import FeedSnapshot
+from MultiSeriesFetcher import MultiSeriesFetcher
+from PollScheduler import PollScheduler
+from SnapshotBuffer import SnapshotBuffer
+
+class FeedPoller(threading.Thread):
+    def __init__(self, series, interval=None, client=None, recorder=None, standbySeries=(), standbyInterval=30, opsFeedUrl=None, historySize=256, staleAfter=15):
+        super(FeedPoller, self).__init__(name='FeedPoller', daemon=True)
+        self.series = series
+        # A fixed interval overrides the adaptive PollScheduler (used for replays)
+        self.interval = interval
+        self.scheduler = PollScheduler()
+        self.client = client
+        self.recorder = recorder
+        self.opsFeedUrl = opsFeedUrl
+        # Other series kept warm (at a slower rate) so setSeries() is instant
+        self.standbySeries = tuple(standbySeries)
+        self.standbyInterval = standbyInterval
+        self.standbyPolledAt = None
+        self.fetcher = None
+        self.sequence = 0
+        # series -> latest FeedSnapshot
+        self.snapshots = {}
+        # series -> (fetchedAt, PointsFeed), refreshed with the standby pass
+        self.points = {}
+        # Recent snapshots of the active series, for sync_delay playback
+        self.history = SnapshotBuffer(historySize)
+        # Time of the last successful poll, 304s included
+        self.lastPollAt = None
+        self.lastError = None
+        self.failureCount = 0
+        # Seconds without a good poll before the feed counts as stale
+        self.staleAfter = staleAfter
+        self.__ready = threading.Event()
+        self.__wake = threading.Event()
+        self.__stopped = False
+
+    @property
+    def snapshot(self):
+        return self.snapshots.get(self.series)
+
+    def run(self):
+        while not self.__stopped:
+            self.poll()
+            if self.interval is not None:
+                self.__wake.wait(self.interval)
+            else:
+                self.__wake.wait(self.scheduler.nextInterval())
+            self.__wake.clear()
+
+    def poll(self):
+        series = self.series
+        try:
+            # Built here rather than in __init__ so even the ops feed fetch
+            # happens off the render thread.
+            if self.client is None:
+                if self.recorder is not None:
+                    # A capture must start with a real ops feed fetch to be replayable
+                    self.client = ApiClient(transport=FeedTransport(recorder=self.recorder), opsCachePath=None, opsFeedUrl=self.opsFeedUrl)
+                else:
+                    self.client = ApiClient(opsFeedUrl=self.opsFeedUrl)
+            if self.__standbyDue():
+                feed = self.__pollWithStandby(series)
+            else:
+                feed = self.client.getLiveFeed(series)
+        except Exception as e:
+            # The last good snapshot stays published; renderers see the age
+            # grow through staleness() and can say so.
+            self.lastError = e
+            self.failureCount += 1
+            self.scheduler.failed()
+            return
+        self.scheduler.observe(feed)
+        self.lastPollAt = time.time()
+        self.lastError = None
+        self.failureCount = 0
+        self.__publish(series, feed, self.lastPollAt)
+
+    def __standbyDue(self):
+        if not self.standbySeries:
+            return False
+        return self.standbyPolledAt is None or time.monotonic() - self.standbyPolledAt >= self.standbyInterval
+
+    def __pollWithStandby(self, series):
+        if self.fetcher is None:
+            self.fetcher = MultiSeriesFetcher(self.client)
+        self.standbyPolledAt = time.monotonic()
+        seriesList = [series] + [other for other in self.standbySeries if other != series]
+        # Points only change a few times a race, so they ride along at the
+        # standby rate for every series, the active one included
+        results, pointsResults = self.fetcher.fetchLiveAndPointsFeeds(seriesList)
+        fetchedAt = time.time()
+        for other, result in results.items():
+            if other != series and not isinstance(result, Exception):
+                self.__publish(other, result, fetchedAt)
+        for other, result in pointsResults.items():
+            # A failed points fetch keeps the last good one
+            if not isinstance(result, Exception):
+                self.points[other] = (fetchedAt, result)
+        feed = results[series]
+        if isinstance(feed, Exception):
+            raise feed
+        return feed
+
+    def __publish(self, series, feed, fetchedAt):
+        # A 304 hands back the very same LiveFeed; only publish real updates.
+        snapshot = self.snapshots.get(series)
+        if snapshot is None or feed is not snapshot.feed:
+            self.sequence += 1
+            self.snapshots[series] = FeedSnapshot(self.sequence, fetchedAt, feed)
+            if series == self.series:
+                self.history.push(fetchedAt, self.snapshots[series])
+                self.__ready.set()
+
+    def setSeries(self, series):
+        if series == self.series:
+            return
+        self.series = series
+        self.scheduler = PollScheduler()
+        # Delayed playback restarts from whatever the new series has
+        self.history.clear()
+        if series in self.snapshots:
+            self.history.push(self.snapshots[series].fetchedAt, self.snapshots[series])
+        self.__wake.set()
+
+    def latest(self, series=None):
+        return self.snapshots.get(self.series if series is None else series)
+
+    def latestPoints(self, series=None):
+        # Latest PointsFeed for the series (the active one by default), or
+        # None if none has been fetched; standby polling must be on for any
+        entry = self.points.get(self.series if series is None else series)
+        return entry[1] if entry is not None else None
+
+    def staleness(self):
+        # Seconds since the last good poll, None before the first one
+        if self.lastPollAt is None:
+            return None
+        return max(time.time() - self.lastPollAt, 0)
+
+    def isStale(self):
+        age = self.staleness()
+        return age is not None and age > self.staleAfter
+
+    def delayed(self, delay):
+        # The active series as it was "delay" seconds ago. Nothing can be
+        # shown ahead of live, so a negative delay is treated as zero.
+        if not delay or delay <= 0:
+            return self.snapshot
+        return self.history.at(time.time() - delay)
+
+    def waitForFirst(self, timeout=None):
+        self.__ready.wait(timeout)
+        return self.snapshot
+
+    def stop(self):
+        self.__stopped = True
+        self.__wake.set()
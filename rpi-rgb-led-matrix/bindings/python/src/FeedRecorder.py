@@ -0,0 +1,52 @@
+import gzip
+import json
+import threading
+import time
+
+# Capture file layout (gzip, one member per recording session, so appending
+# to an existing capture never rewrites it):
+#
+#   {"t": <unix time>, "url": "<url>", "size": <n>}\n
+#   <n raw body bytes>\n
+#
+# The stream is sync-flushed after every record; a capture cut short by a
+# crash or power loss still reads back up to the last complete record.
+class FeedRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.file = gzip.open(path, 'ab')
+        self.lock = threading.Lock()
+        self.recordCount = 0
+
+    def record(self, url, body, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        header = json.dumps({'t': timestamp, 'url': url, 'size': len(body)})
+        with self.lock:
+            self.file.write(header.encode('utf-8') + b'\n')
+            self.file.write(body)
+            self.file.write(b'\n')
+            self.file.flush()
+            self.recordCount += 1
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    @staticmethod
+    def read(path):
+        # Yields (timestamp, url, body) in recording order.
+        with gzip.open(path, 'rb') as f:
+            while True:
+                try:
+                    header = f.readline()
+                    if not header:
+                        return
+                    meta = json.loads(header)
+                    body = f.read(meta['size'])
+                    if len(body) != meta['size'] or f.read(1) != b'\n':
+                        return
+                except (EOFError, ValueError):
+                    # Truncated tail of a capture that was still being written
+                    return
+                yield meta['t'], meta['url'], body
@@ -0,0 +1,5 @@
+from collections import namedtuple
+
+# One published LiveFeed. The poller never mutates a feed after publishing it,
+# so a renderer can hold on to a snapshot for as long as it likes.
+FeedSnapshot = namedtuple('FeedSnapshot', ['sequence', 'fetchedAt', 'feed'])
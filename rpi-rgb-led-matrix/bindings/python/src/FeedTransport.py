@@ -0,0 +1,117 @@
+import io
+import time
+import requests
+import urllib3
+
+class FeedTransport:
+    # (connect, read) in seconds. A hung request must never stall the sign.
+    DEFAULT_TIMEOUT = (3.05, 5)
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, poolSize=4, recorder=None):
+        self.timeout = timeout
+        # Optional FeedRecorder that gets every raw 200 body
+        self.recorder = recorder
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        # url -> (etag, last_modified) of the last 200 response
+        self.validators = {}
+
+        self.requestCount = 0
+        self.notModifiedCount = 0
+        self.errorCount = 0
+        self.bytesReceived = 0
+        self.totalLatency = 0.0
+        self.lastLatency = 0.0
+
+    def get(self, url, parse=None):
+        # Returns the decoded JSON body, {} if the body is not JSON, or None
+        # if the server answered 304 and the caller should keep what it has.
+        # With "parse" the body is streamed straight into parse(fileobj)
+        # instead of being buffered and handed to r.json().
+        headers = {}
+        etag, lastModified = self.validators.get(url, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if lastModified:
+            headers['If-Modified-Since'] = lastModified
+
+        # Recording needs the raw body, so it turns streaming off.
+        stream = parse is not None and self.recorder is None
+        start = time.monotonic()
+        try:
+            r = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+        except requests.RequestException:
+            self.errorCount += 1
+            raise
+        finally:
+            self.lastLatency = time.monotonic() - start
+            self.totalLatency += self.lastLatency
+            self.requestCount += 1
+
+        try:
+            if r.status_code == 304:
+                self.notModifiedCount += 1
+                return None
+
+            if not r.ok:
+                self.errorCount += 1
+                self.validators.pop(url, None)
+                return {}
+
+            if self.recorder is not None:
+                self.recorder.record(url, r.content)
+            try:
+                if stream:
+                    r.raw.decode_content = True
+                    data = parse(r.raw)
+                elif parse is not None:
+                    data = parse(io.BytesIO(r.content))
+                else:
+                    data = r.json()
+            except ValueError:
+                self.validators.pop(url, None)
+                return {}
+            except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+                # The connection dropped partway through a streamed body.
+                # Raised as a requests error so callers see an OSError, and
+                # with no validators kept, so the next poll is not a 304.
+                self.errorCount += 1
+                self.validators.pop(url, None)
+                if isinstance(e, requests.RequestException):
+                    raise
+                raise requests.ConnectionError(e) from e
+            # Only a fully read body may answer later If-None-Match requests
+            self.validators[url] = (r.headers.get('ETag'), r.headers.get('Last-Modified'))
+            return data
+        finally:
+            # Count what came over the wire, i.e. the compressed size if gzipped.
+            if stream:
+                self.bytesReceived += r.raw.tell()
+            else:
+                self.bytesReceived += int(r.headers.get('Content-Length', len(r.content)))
+            r.close()
+
+    def forget(self, url):
+        self.validators.pop(url, None)
+
+    def stats(self):
+        requestCount = self.requestCount or 1
+        return {
+            'requests': self.requestCount,
+            'not_modified': self.notModifiedCount,
+            'not_modified_ratio': self.notModifiedCount / requestCount,
+            'errors': self.errorCount,
+            'bytes': self.bytesReceived,
+            'avg_latency': self.totalLatency / requestCount,
+            'last_latency': self.lastLatency,
+        }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,5 @@
+# Raised by ApiClient when upstream cannot be reached or sends something that
+# is not a usable feed. Nothing has been swapped in when this is raised, so
+# the caller can carry on with the last good feed.
+class FeedUnavailable(Exception):
+    pass
@@ -7,4 +7,9 @@ class FlagStatus(Enum):
     WHITE = 4
     CHECKERED = 5
     ORANGE = 8
-    UNKNOWN = 9
\ No newline at end of file
+    UNKNOWN = 9
+
+    @classmethod
+    def _missing_(cls, value):
+        # A flag code we have never seen should not throw away the whole feed
+        return cls.UNKNOWN
@@ -0,0 +1,113 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Builds a whole pylon frame as one (height, width, 3) uint8 NumPy array and
+# pushes it to the canvas with a single SetPixelsFromBuffer() call, instead
+# of one binding call per rectangle, string and badge. Everything is a slice
+# assignment: fills are broadcasts, text is drawn from glyph masks
+# rasterised once per character from a BdfFont, and images (badges,
+# RowSprites rows) are converted to arrays once and then copied as tiles.
+#
+# Drawing is in pylon coordinates, like PanelLayout's tables; push() puts
+# the rows in canvas order on the way out. The frame being composed is
+# "pixels", so a test can assert on its content without a matrix.
+#
+# NumPy is optional: check FrameCompositor.available before using it.
+class FrameCompositor:
+    available = numpy is not None
+
+    def __init__(self, layout, font, maxTiles=1024):
+        if numpy is None:
+            raise Exception('FrameCompositor needs numpy')
+        self.layout = layout
+        self.font = font
+        self.width = layout.width
+        self.height = layout.height
+        self.pixels = numpy.zeros((self.height, self.width, 3), numpy.uint8)
+        # Canvas row i shows pylon row canvasRows[i]
+        canvasRows = [0] * self.height
+        for y, canvasY in enumerate(layout.canvasY):
+            canvasRows[canvasY] = y
+        self.canvasRows = numpy.array(canvasRows, numpy.intp)
+        self.inOrder = canvasRows == list(range(self.height))
+        self.canvasPixels = numpy.zeros_like(self.pixels)
+        # codepoint -> (deviceWidth, top relative to the baseline, mask)
+        self.glyphs = {}
+        # id(image) -> (image, array); the image is kept so the id stays valid
+        self.tiles = {}
+        self.maxTiles = maxTiles
+
+    def clear(self):
+        self.pixels[:] = 0
+
+    def fill(self, x, top, width, height, color):
+        # Negative starts would wrap around in a slice, so clip them first
+        self.pixels[max(top, 0):max(top + height, 0), max(x, 0):max(x + width, 0)] = color
+
+    def __glyph(self, codepoint):
+        glyph = self.glyphs.get(codepoint)
+        if glyph is None:
+            bdfGlyph = self.font.glyph(codepoint)
+            if bdfGlyph is None:
+                return None
+            deviceWidth, yOffset, rows = bdfGlyph
+            mask = numpy.zeros((len(rows), deviceWidth), bool)
+            for row, lit in enumerate(rows):
+                mask[row, list(lit)] = True
+            glyph = (deviceWidth, -len(rows) - yOffset, mask)
+            self.glyphs[codepoint] = glyph
+        return glyph
+
+    def __clip(self, x, top, width, height):
+        # (destination slices, source slices) of a width x height block at
+        # x, top that is on the frame, or None if none of it is
+        x0, y0 = max(x, 0), max(top, 0)
+        x1, y1 = min(x + width, self.width), min(top + height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (slice(y0, y1), slice(x0, x1)), (slice(y0 - top, y1 - top), slice(x0 - x, x1 - x))
+
+    def text(self, x, baseline, color, text):
+        # Same placement as DrawText(); returns how far x advanced
+        start = x
+        for character in text:
+            glyph = self.__glyph(ord(character))
+            if glyph is None:
+                continue
+            deviceWidth, offset, mask = glyph
+            clipped = self.__clip(x, baseline + offset, mask.shape[1], mask.shape[0])
+            if clipped is not None:
+                target, source = clipped
+                self.pixels[target][mask[source]] = color
+            x += deviceWidth
+        return x - start
+
+    def tile(self, image):
+        # The image as a (height, width, 3) array, converted once per image
+        entry = self.tiles.get(id(image))
+        if entry is not None and entry[0] is image:
+            return entry[1]
+        array = numpy.asarray(image.convert('RGB') if image.mode != 'RGB' else image, numpy.uint8)
+        if len(self.tiles) >= self.maxTiles:
+            self.tiles.clear()
+        self.tiles[id(image)] = (image, array)
+        return array
+
+    def image(self, image, x, top):
+        array = image if isinstance(image, numpy.ndarray) else self.tile(image)
+        clipped = self.__clip(x, top, array.shape[1], array.shape[0])
+        if clipped is not None:
+            target, source = clipped
+            self.pixels[target] = array[source]
+
+    def push(self, canvas):
+        # The whole frame in one call, rows reordered for the canvas if the
+        # panels run bottom first
+        if self.inOrder:
+            frame = self.pixels
+        else:
+            numpy.take(self.pixels, self.canvasRows, axis=0, out=self.canvasPixels)
+            frame = self.canvasPixels
+        canvas.SetPixelsFromBuffer(0, 0, self.width, self.height, frame)
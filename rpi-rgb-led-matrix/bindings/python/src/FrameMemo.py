@@ -0,0 +1,40 @@
+# Remembers the display state behind the frame on the sign, so a renderer
+# can skip redrawing (and swapping) when a poll changes nothing it shows.
+# Under caution or red flag the feed often repeats itself for minutes;
+# those cycles then cost a tuple comparison instead of a full frame.
+#
+# The key is built from everything that affects the picture: running
+# order, each car's movement colour, flag, laps to go, the display mode and
+# favourite driver from pylon_config.json, plus anything else the renderer
+# passes in (staleness marker, badge generation, ...). Keys are kept whole
+# rather than reduced to a hash, so a hit can never be a collision.
+class FrameMemo:
+    def __init__(self):
+        self.key = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def stateKey(feed, diff=None, displayMode=None, favoriteDriver=None, *extra):
+        if diff is not None:
+            order = tuple((vehicle.vehicleNumber, diff.movement(vehicle.vehicleNumber)) for vehicle in feed.vehicles)
+        else:
+            order = tuple(vehicle.vehicleNumber for vehicle in feed.vehicles)
+        return (order, feed.flagStatus, feed.lapsToGo, displayMode, favoriteDriver) + extra
+
+    def check(self, key):
+        # True if the sign already shows this state, otherwise remembers it
+        # as the new one and returns False so the caller redraws.
+        if key == self.key:
+            self.hits += 1
+            return True
+        self.misses += 1
+        self.key = key
+        return False
+
+    def invalidate(self):
+        self.key = None
+
+    def stats(self):
+        lookups = (self.hits + self.misses) or 1
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / lookups}
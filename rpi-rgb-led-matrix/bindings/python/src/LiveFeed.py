@@ -2,13 +2,23 @@ from FlagStatus import FlagStatus
 from Vehicle import Vehicle
 
 class LiveFeed:
+    __slots__ = ('lapNumber', 'flagStatus', 'lapsInRace', 'lapsToGo', 'vehicles', '__vehicleIndex')
+
     def __init__(self, r):
         self.lapNumber = r['lap_number']
         self.flagStatus = FlagStatus(r['flag_state'])
         self.lapsInRace = r['laps_in_race']
         self.lapsToGo = r['laps_to_go']
-        vehicles = []
-        for vehicleData in r['vehicles']:
-            vehicle = Vehicle(vehicleData)
-            vehicles.append(vehicle)
-        self.vehicles = vehicles
\ No newline at end of file
+        self.vehicles = [Vehicle(vehicleData) for vehicleData in r['vehicles']]
+        self.__vehicleIndex = None
+
+    def vehicleIndex(self):
+        # vehicleNumber -> (position, vehicle), built once per feed on demand
+        if self.__vehicleIndex is None:
+            index = {}
+            position = 0
+            for vehicle in self.vehicles:
+                position += 1
+                index[vehicle.vehicleNumber] = (position, vehicle)
+            self.__vehicleIndex = index
+        return self.__vehicleIndex
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Fetches several series at once through one ApiClient, i.e. one
+# FeedTransport session and its keep-alive connection pool.
+class MultiSeriesFetcher:
+    def __init__(self, client, maxWorkers=4):
+        self.client = client
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='SeriesFetch')
+
+    def fetchLiveFeeds(self, seriesList):
+        return self.fetchAll(seriesList, self.client.getLiveFeed)
+
+    def fetchPointsFeeds(self, seriesList):
+        return self.fetchAll(seriesList, self.client.getPointsFeed)
+
+    def fetchLiveAndPointsFeeds(self, seriesList):
+        # (live results, points results), all requests in flight together
+        liveFutures = self.__submit(seriesList, self.client.getLiveFeed)
+        pointsFutures = self.__submit(seriesList, self.client.getPointsFeed)
+        return self.__collect(liveFutures), self.__collect(pointsFutures)
+
+    def fetchAll(self, seriesList, fetch):
+        # series -> feed, or the exception that fetch raised for it, so one
+        # broken series never costs us the others.
+        return self.__collect(self.__submit(seriesList, fetch))
+
+    def __submit(self, seriesList, fetch):
+        return [(series, self.executor.submit(fetch, series)) for series in seriesList]
+
+    def __collect(self, futures):
+        results = {}
+        for series, future in futures:
+            try:
+                results[series] = future.result()
+            except Exception as e:
+                results[series] = e
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=False)
@@ -1,3 +1,5 @@
+from Series import Series
+
 class OpsFeed:
     def __init__(self, r):
         self.cupLiveFeedUrl = r['live_feed_url_series1']
@@ -5,4 +7,31 @@ class OpsFeed:
         self.trucksLiveFeedUrl = r['live_feed_url_series3']
         self.cupPointsFeedUrl = r['driver_points_feed_url_series1']
         self.xfinityPointsFeedUrl = r['driver_points_feed_url_series2']
-        self.trucksPointsFeedUrl = r['driver_points_feed_url_series3']
\ No newline at end of file
+        self.trucksPointsFeedUrl = r['driver_points_feed_url_series3']
+        # ARCA is not always published in live-ops.json
+        self.arcaLiveFeedUrl = r.get('live_feed_url_series4')
+        self.arcaPointsFeedUrl = r.get('driver_points_feed_url_series4')
+
+    def liveFeedUrl(self, series):
+        match series:
+            case Series.CUP:
+                return self.cupLiveFeedUrl
+            case Series.XFINITY:
+                return self.xfinityLiveFeedUrl
+            case Series.TRUCKS:
+                return self.trucksLiveFeedUrl
+            case Series.ARCA:
+                return self.arcaLiveFeedUrl
+        return None
+
+    def pointsFeedUrl(self, series):
+        match series:
+            case Series.CUP:
+                return self.cupPointsFeedUrl
+            case Series.XFINITY:
+                return self.xfinityPointsFeedUrl
+            case Series.TRUCKS:
+                return self.trucksPointsFeedUrl
+            case Series.ARCA:
+                return self.arcaPointsFeedUrl
+        return None
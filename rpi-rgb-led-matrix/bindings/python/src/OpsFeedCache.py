@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import time
+
+# Last good live-ops.json on disk, so a restart can render straight away with
+# the feed URLs we already know and revalidate them in the background.
+class OpsFeedCache:
+    DEFAULT_PATH = os.path.expanduser('~/.cache/pylon/live-ops.json')
+
+    def __init__(self, path=DEFAULT_PATH, ttl=6 * 60 * 60, retryInterval=60):
+        self.path = path
+        self.ttl = ttl
+        self.retryInterval = retryInterval
+        self.url = None
+        self.data = None
+        self.validators = None
+        self.fetchedAt = 0.0
+        self.lastAttempt = None
+
+    def load(self, url):
+        # Returns the cached ops feed body for url, or None.
+        try:
+            with open(self.path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('url') != url or not isinstance(cached.get('data'), dict):
+            return None
+        self.url = url
+        self.data = cached['data']
+        self.validators = tuple(cached.get('validators') or (None, None))
+        self.fetchedAt = cached.get('fetched_at', 0.0)
+        return self.data
+
+    def save(self, url, data, validators=None):
+        self.url = url
+        self.data = data
+        self.validators = validators or (None, None)
+        self.fetchedAt = time.time()
+        self.lastAttempt = time.monotonic()
+        self.__write()
+
+    def touch(self):
+        # Upstream confirmed (304) what we already have.
+        self.fetchedAt = time.time()
+        self.lastAttempt = time.monotonic()
+        if self.data is not None:
+            self.__write()
+
+    def attempted(self):
+        self.lastAttempt = time.monotonic()
+
+    def isStale(self):
+        return time.time() - self.fetchedAt > self.ttl
+
+    def isDue(self):
+        if not self.isStale():
+            return False
+        return self.lastAttempt is None or time.monotonic() - self.lastAttempt > self.retryInterval
+
+    def __write(self):
+        # Same tmp + os.replace dance as pylon_ui, so a power cut mid-write
+        # never leaves a half written cache. Failing to cache is not fatal.
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix='.live-ops-', dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'url': self.url,
+                    'fetched_at': self.fetchedAt,
+                    'validators': list(self.validators),
+                    'data': self.data,
+                }, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
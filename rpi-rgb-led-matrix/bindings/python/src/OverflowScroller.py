@@ -0,0 +1,50 @@
+import time
+
+# Time-based pager for rows that do not fit on the sign. Each row holds
+# still for "dwell" seconds, then the window slides up one row over
+# "transition" seconds, wrapping around at the end. Where the window is
+# depends only on the clock, so the animation runs at the same speed
+# whatever the frame rate, and the renderer can redraw (and pick up new
+# feeds) every frame instead of sleeping per car.
+class OverflowScroller:
+    def __init__(self, rowHeight, slots=1, dwell=2.0, transition=0.5):
+        self.rowHeight = rowHeight
+        # Rows visible at once in the overflow area
+        self.slots = slots
+        self.dwell = dwell
+        self.transition = transition
+        self.startedAt = None
+
+    def reset(self, now=None):
+        self.startedAt = time.monotonic() if now is None else now
+
+    def window(self, count, now=None):
+        # (index of the top visible row, pixels it has scrolled up by)
+        if count <= self.slots:
+            return 0, 0
+        if now is None:
+            now = time.monotonic()
+        if self.startedAt is None:
+            self.startedAt = now
+        cycle = self.dwell + self.transition
+        elapsed = max(now - self.startedAt, 0)
+        step = int(elapsed // cycle)
+        phase = elapsed - step * cycle
+        offset = 0
+        if phase > self.dwell and self.transition > 0:
+            progress = (phase - self.dwell) / self.transition
+            # Ease in and out so rows do not lurch at the ends of the slide
+            progress = progress * progress * (3 - 2 * progress)
+            offset = min(int(progress * self.rowHeight), self.rowHeight - 1)
+        return step % count, offset
+
+    def visible(self, items, now=None):
+        # [(item, y offset from the top of the overflow area)], including
+        # the row sliding in from below during a transition
+        first, offset = self.window(len(items), now)
+        if len(items) <= self.slots:
+            return [(item, k * self.rowHeight) for k, item in enumerate(items)]
+        rows = []
+        for k in range(self.slots + (1 if offset else 0)):
+            rows.append((items[(first + k) % len(items)], k * self.rowHeight - offset))
+        return rows
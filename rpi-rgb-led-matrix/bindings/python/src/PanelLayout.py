@@ -0,0 +1,165 @@
+# Where everything goes on the pylon, compiled once from the panel geometry
+# (led_rows/led_cols/led_chain/led_pixel_mapper in pylon_config.json) into
+# flat coordinate tables, so the renderers only index lists at draw time.
+#
+# Renderers lay things out in pylon coordinates: y=0 is the top of the
+# physical pylon and rows count down from the header. The canvas does not
+# always agree: with the chain rotated 270 degrees the panels come out
+# bottom first (drawing at y=0 lights the bottom panel), so pylon panel p
+# is canvas panel (panels - 1 - p). canvasY holds that mapping for every
+# pixel row, and segments() splits anything crossing a panel edge.
+#
+#   y=0          +-----------------+
+#                |  header band    |  headerHeight
+#   y=rowTop     +-----------------+
+#                | pos  [badge]    |  rowPitch, packed so no row
+#                | pos  [badge]    |  straddles two panels
+#                ...
+class PanelLayout:
+    LAYOUT = {
+        'headerHeight': 14,
+        # Baselines of the "N Laps" and "To Go" lines inside the band
+        'headerBaselines': (6, 13),
+        'rowTop': 16,
+        'rowPitch': 16,
+        'maxRows': 40,
+        'positionX': 2,
+        'badgeX': 12,
+        'badgeSize': 16,
+    }
+
+    def __init__(self, rows=64, cols=32, chain=16, parallel=1, pixelMapper='', panelOrder=None,
+                 width=None, height=None, **layout):
+        unknown = set(layout) - set(self.LAYOUT)
+        if unknown:
+            raise Exception(f'Unknown layout settings: {", ".join(sorted(unknown))}')
+        self.layout = {**self.LAYOUT, **layout}
+        for key, value in self.layout.items():
+            setattr(self, key, value)
+
+        # Canvas geometry as the pixel mappers leave it
+        canvasWidth, canvasHeight = cols * chain, rows * parallel
+        panelWidth, panelHeight = cols, rows
+        rotation = 0
+        for mapper in (pixelMapper or '').split(';'):
+            name, _, parameter = mapper.strip().partition(':')
+            if name == 'Rotate':
+                angle = int(parameter or 0) % 360
+                rotation = (rotation + angle) % 360
+                if angle in (90, 270):
+                    canvasWidth, canvasHeight = canvasHeight, canvasWidth
+                    panelWidth, panelHeight = panelHeight, panelWidth
+            elif name == 'U-mapper':
+                canvasWidth, canvasHeight = canvasWidth // 2, canvasHeight * 2
+
+        # The matrix knows best if the command line overrode pylon_config.json
+        self.width = width or canvasWidth
+        self.height = height or canvasHeight
+        self.panelHeight = min(panelHeight, self.height)
+        self.panels = max(self.height // self.panelHeight, 1)
+        if panelOrder is None:
+            panelOrder = 'reversed' if rotation == 270 else 'normal'
+        if panelOrder not in ('normal', 'reversed'):
+            raise Exception(f'Unknown panel order: {panelOrder}')
+        self.panelOrder = panelOrder
+
+        self.canvasY = [self.__toCanvas(y) for y in range(self.height)]
+        self.segmentCache = {}
+
+        # Row tops in pylon coordinates; a row that would run over a panel
+        # edge moves down to the start of the next panel instead
+        self.rowTops = []
+        top = self.rowTop
+        pitch = self.rowPitch
+        while len(self.rowTops) < self.maxRows and top + pitch <= self.height:
+            if pitch <= self.panelHeight and top // self.panelHeight != (top + pitch - 1) // self.panelHeight:
+                top = (top // self.panelHeight + 1) * self.panelHeight
+                continue
+            self.rowTops.append(top)
+            top += pitch
+        if not self.rowTops:
+            self.rowTops.append(self.rowTop)
+        self.rowCount = len(self.rowTops)
+        self.lastRowTop = self.rowTops[-1]
+
+        self.headerSegments = self.segments(0, self.headerHeight)
+        self.headerBaselineYs = [self.canvasY[y] for y in self.headerBaselines]
+
+    @staticmethod
+    def fromConfig(config, width=None, height=None, **layout):
+        # config is a PylonConfig; width/height are the matrix's own, if known
+        return PanelLayout(rows=int(config.get('led_rows', 64)),
+                           cols=int(config.get('led_cols', 32)),
+                           chain=int(config.get('led_chain', 16)),
+                           parallel=int(config.get('led_parallel', 1)),
+                           pixelMapper=config.get('led_pixel_mapper', ''),
+                           panelOrder=config.get('led_panel_order'),
+                           width=width, height=height, **layout)
+
+    def __toCanvas(self, y):
+        if self.panelOrder == 'normal' or y >= self.panels * self.panelHeight:
+            return y
+        panel, offset = divmod(y, self.panelHeight)
+        return (self.panels - 1 - panel) * self.panelHeight + offset
+
+    def toCanvas(self, y):
+        # Canvas y of pylon y, or None if it is off the sign
+        if 0 <= y < self.height:
+            return self.canvasY[y]
+        return None
+
+    def segments(self, top, height):
+        # [(canvas y, first source row, end source row)] covering pylon rows
+        # top..top+height-1 that are on the sign, one entry per panel touched
+        key = (top, height)
+        result = self.segmentCache.get(key)
+        if result is not None:
+            return result
+        result = []
+        y = max(top, 0)
+        end = min(top + height, self.height)
+        while y < end:
+            if self.panelOrder == 'normal':
+                stop = end
+            else:
+                stop = min(end, (y // self.panelHeight + 1) * self.panelHeight)
+            result.append((self.canvasY[y], y - top, stop - top))
+            y = stop
+        if len(self.segmentCache) >= 4096:
+            self.segmentCache.clear()
+        self.segmentCache[key] = result
+        return result
+
+    def rowY(self, index, offset=0):
+        # Pylon top of whatever sits "offset" pixels below the top of row
+        # "index" (0-based), counting in whole row pitches so that slides
+        # between rows skip the gaps left at panel edges. Rows past the end
+        # of the table continue at the same pitch.
+        steps, remainder = divmod(offset, self.rowPitch)
+        index += steps
+        if index < 0:
+            return self.rowTops[0] + index * self.rowPitch + remainder
+        if index >= self.rowCount:
+            return self.lastRowTop + (index - self.rowCount + 1) * self.rowPitch + remainder
+        return self.rowTops[index] + remainder
+
+    # Drawing helpers: pylon coordinates in, DrawList commands out
+
+    def fillRect(self, drawList, x, top, width, height, color):
+        for y, start, end in self.segments(top, height):
+            drawList.FillRect(x, y, width, end - start, color)
+
+    def setImage(self, drawList, image, x, top):
+        parts = self.segments(top, image.size[1])
+        if len(parts) == 1 and parts[0][1] == 0 and parts[0][2] == image.size[1]:
+            drawList.SetImage(image, x, parts[0][0])
+            return
+        for y, start, end in parts:
+            drawList.SetImage(image.crop((0, start, image.size[0], end)), x, y)
+
+    def drawText(self, drawList, font, x, baseline, color, text):
+        # Text is expected to sit inside one panel, which packed rows and
+        # the header band always do
+        y = self.toCanvas(baseline)
+        if y is not None:
+            drawList.DrawText(font, x, y, color, text)
@@ -1,3 +1,6 @@
 class PitStop:
+    __slots__ = ('pitInLeaderLap', 'pitOutElapsedTime')
+
     def __init__(self, r):
         self.pitInLeaderLap = r['pit_in_leader_lap']
+        self.pitOutElapsedTime = r.get('pit_out_elapsed_time', 0)
@@ -0,0 +1,5 @@
+class PointsFeed:
+    def __init__(self, r):
+        # The points feed is a bare list of per-driver standings; we keep the
+        # entries as they come, nothing on the sign reads them field by field yet.
+        self.entries = r if isinstance(r, list) else []
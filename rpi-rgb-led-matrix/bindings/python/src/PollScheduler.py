@@ -0,0 +1,105 @@
+import random
+import time
+from FlagStatus import FlagStatus
+
+class PollScheduler:
+    # Base seconds between live-feed polls for each flag.
+    FLAG_INTERVALS = {
+        FlagStatus.GREEN: 2,
+        FlagStatus.WHITE: 1,
+        FlagStatus.CAUTION: 4,
+        FlagStatus.RED: 20,
+        FlagStatus.CHECKERED: 30,
+        FlagStatus.ORANGE: 10,
+        FlagStatus.NONE: 60,
+        FlagStatus.UNKNOWN: 5,
+    }
+    FINISH_LAPS = 5
+    FINISH_INTERVAL = 1
+
+    def __init__(self, minInterval=1, maxInterval=60, maxBackoff=120, jitter=0.1):
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+        self.maxBackoff = maxBackoff
+        self.jitter = jitter
+
+        self.lastFeed = None
+        self.lastSignature = None
+        self.lastChangeAt = None
+        # Smoothed seconds between upstream updates (lap or order changes)
+        self.cadence = None
+        self.failures = 0
+
+        self.pollCount = 0
+        self.changeCount = 0
+        self.interval = minInterval
+        self.reason = 'startup'
+
+    def observe(self, feed, now=None):
+        if now is None:
+            now = time.monotonic()
+        self.pollCount += 1
+        self.failures = 0
+        if feed is self.lastFeed:
+            return
+        self.lastFeed = feed
+        signature = (feed.lapNumber, feed.flagStatus, tuple(vehicle.vehicleNumber for vehicle in feed.vehicles))
+        if signature == self.lastSignature:
+            return
+        if self.lastSignature is not None:
+            self.changeCount += 1
+            # Caution laps tick far slower than green ones; start over on a new flag
+            if signature[1] != self.lastSignature[1]:
+                self.cadence = None
+                self.lastChangeAt = None
+            if self.lastChangeAt is not None:
+                gap = now - self.lastChangeAt
+                self.cadence = gap if self.cadence is None else 0.7 * self.cadence + 0.3 * gap
+            self.lastChangeAt = now
+        self.lastSignature = signature
+
+    def succeeded(self):
+        # Upstream answered but had nothing new (a 304)
+        self.pollCount += 1
+        self.failures = 0
+
+    def failed(self):
+        self.pollCount += 1
+        self.failures += 1
+
+    def nextInterval(self):
+        if self.failures:
+            ceiling = min(self.maxBackoff, self.minInterval * 2 ** self.failures)
+            # "Full jitter" so a venue full of pylons does not retry in lockstep
+            self.interval = random.uniform(self.minInterval, ceiling)
+            self.reason = f'backoff x{self.failures}'
+            return self.interval
+
+        feed = self.lastFeed
+        if feed is None:
+            interval, reason = self.minInterval, 'startup'
+        elif feed.flagStatus in (FlagStatus.GREEN, FlagStatus.WHITE, FlagStatus.CAUTION) and 0 <= feed.lapsToGo <= self.FINISH_LAPS:
+            interval, reason = self.FINISH_INTERVAL, 'finish'
+        else:
+            interval = self.FLAG_INTERVALS.get(feed.flagStatus, self.FLAG_INTERVALS[FlagStatus.UNKNOWN])
+            reason = feed.flagStatus.name.lower()
+            # No point asking much more than twice per upstream update, but
+            # never back off more than 3x the flag's own rate because of it.
+            if self.cadence is not None and interval < self.cadence / 2:
+                interval, reason = min(self.cadence / 2, interval * 3), f'{reason}, cadence {self.cadence:.1f}s'
+
+        interval = min(self.maxInterval, max(self.minInterval, interval))
+        self.interval = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.reason = reason
+        return self.interval
+
+    def metrics(self):
+        return {
+            'interval': self.interval,
+            'reason': self.reason,
+            'cadence': self.cadence,
+            'failures': self.failures,
+            'polls': self.pollCount,
+            'changes': self.changeCount,
+            'change_ratio': self.changeCount / (self.pollCount or 1),
+        }
@@ -0,0 +1,59 @@
+import json
+import os
+from Series import Series
+
+# Read-only view of the pylon_config.json that pylon_ui writes. reload() is
+# a cheap stat() so renderers can call it every frame and react to changes
+# saved from the web UI without a service restart.
+class PylonConfig:
+    DEFAULT_PATH = '/home/tonicinnovations/pylon_ui/pylon_config.json'
+    DEFAULTS = {
+        'series': 'CUP',
+        'display': 'last_name',
+        'favorite_driver': None,
+        'sync_delay': 0.0,
+        # live-ops.json URL of a FeedHub to use instead of NASCAR's
+        'feed_hub': None,
+        # Panel geometry, as passed to the matrix; see PanelLayout
+        'led_rows': 64,
+        'led_cols': 32,
+        'led_chain': 16,
+        'led_parallel': 1,
+        'led_pixel_mapper': 'Rotate:270',
+        # 'normal' or 'reversed'; None works it out from the pixel mapper
+        'led_panel_order': None,
+    }
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.mtime = None
+        self.values = dict(self.DEFAULTS)
+        self.reload()
+
+    def reload(self):
+        # Returns True if the file changed since the last call.
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return False
+        if mtime == self.mtime:
+            return False
+        try:
+            with open(self.path) as f:
+                values = json.load(f)
+        except (OSError, ValueError):
+            # Caught pylon_ui mid-write; try again next time.
+            return False
+        self.mtime = mtime
+        self.values = {**self.DEFAULTS, **values}
+        return True
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    @property
+    def series(self):
+        try:
+            return Series[str(self.values.get('series', 'CUP')).upper()]
+        except KeyError:
+            return Series.CUP
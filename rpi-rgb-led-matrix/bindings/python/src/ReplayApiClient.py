@@ -0,0 +1,10 @@
+from ApiClient import ApiClient
+from ReplayTransport import ReplayTransport
+
+class ReplayApiClient(ApiClient):
+    def __init__(self, path, speed=1.0, parser=None):
+        super(ReplayApiClient, self).__init__(transport=ReplayTransport(path, speed), parser=parser, opsCachePath=None)
+
+    @property
+    def finished(self):
+        return self.transport.finished
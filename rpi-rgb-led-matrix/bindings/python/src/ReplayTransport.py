@@ -0,0 +1,109 @@
+import io
+import json
+import time
+from FeedRecorder import FeedRecorder
+
+# Stands in for FeedTransport and serves bodies from a FeedRecorder capture.
+# speed=1 replays in real time, speed=N N times faster, speed=0 as fast as
+# possible: every get() of a url moves on to that url's next recorded body.
+class ReplayTransport:
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+        # Urls known to be in the capture. A request for one not seen yet is
+        # looked up with a second reader that stops at its first record, so
+        # a url that was never recorded cannot make the replay fast-forward
+        # through the whole file; the capture is only read twice over if
+        # such a url is asked for, and then only once.
+        self.urls = set()
+        self.scan = None
+        self.records = FeedRecorder.read(path)
+        self.pending = next(self.records, None)
+        if self.pending is not None:
+            self.urls.add(self.pending[1])
+        self.captureStart = self.pending[0] if self.pending else 0.0
+        self.captureTime = self.captureStart
+        self.replayStart = None
+        self.finished = self.pending is None
+        # url -> latest body at captureTime, and which of those were served
+        self.bodies = {}
+        self.served = set()
+
+        self.requestCount = 0
+        self.notModifiedCount = 0
+        self.bytesReceived = 0
+
+    def __advance(self):
+        timestamp, url, body = self.pending
+        self.captureTime = timestamp
+        self.bodies[url] = body
+        self.served.discard(url)
+        self.pending = next(self.records, None)
+        if self.pending is None:
+            self.finished = True
+        else:
+            self.urls.add(self.pending[1])
+        return url
+
+    def __recorded(self, url):
+        if url in self.urls:
+            return True
+        if self.scan is None:
+            self.scan = FeedRecorder.read(self.path)
+        for _, recorded, _ in self.scan:
+            self.urls.add(recorded)
+            if recorded == url:
+                return True
+        return False
+
+    def __seek(self, url):
+        if not self.__recorded(url):
+            return
+        if self.speed <= 0:
+            if url not in self.bodies or url in self.served:
+                while self.pending is not None:
+                    if self.__advance() == url:
+                        break
+            return
+        if self.replayStart is None:
+            self.replayStart = time.monotonic()
+        now = self.captureStart + (time.monotonic() - self.replayStart) * self.speed
+        while self.pending is not None and (self.pending[0] <= now or url not in self.bodies):
+            self.__advance()
+
+    def get(self, url, parse=None):
+        self.requestCount += 1
+        self.__seek(url)
+        if url in self.served:
+            self.notModifiedCount += 1
+            return None
+        body = self.bodies.get(url)
+        if body is None:
+            return {}
+        self.served.add(url)
+        self.bytesReceived += len(body)
+        try:
+            if parse is None:
+                return json.loads(body)
+            return parse(io.BytesIO(body))
+        except ValueError:
+            return {}
+
+    def forget(self, url):
+        self.served.discard(url)
+
+    def stats(self):
+        requestCount = self.requestCount or 1
+        return {
+            'requests': self.requestCount,
+            'not_modified': self.notModifiedCount,
+            'not_modified_ratio': self.notModifiedCount / requestCount,
+            'bytes': self.bytesReceived,
+            'capture_time': self.captureTime,
+            'finished': self.finished,
+        }
+
+    def close(self):
+        self.records.close()
+        if self.scan is not None:
+            self.scan.close()
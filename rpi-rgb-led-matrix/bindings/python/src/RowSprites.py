@@ -0,0 +1,60 @@
+from PIL import Image
+
+# Leaderboard rows rendered once into small RGB images and blitted with
+# SetImage(), instead of two or three DrawText()/SetImage() calls per car
+# per frame. A row is the position number, then the car's badge or, with no
+# badge, its number in the movement colour:
+#
+#   x=0          x=badgeX
+#   | 12 |  [badge 16x16]  |
+#
+# Sprites are keyed by everything that changes their pixels, including the
+# badge directory's generation, so a badge upload retires the old sprites on
+# its own. Changing the font or layout means building a new RowSprites.
+class RowSprites:
+    def __init__(self, font, badges, width=28, height=16, badgeX=12, positionX=2, baselineY=8, maxEntries=512):
+        self.font = font
+        self.badges = badges
+        self.width = width
+        self.height = height
+        self.badgeX = badgeX
+        self.positionX = positionX
+        self.baselineY = baselineY
+        self.maxEntries = maxEntries
+        self.sprites = {}
+        self.hits = 0
+        self.renders = 0
+
+    def get(self, position, vehicleNumber, badgeDir, color, positionColor=(255, 255, 255)):
+        badge = self.badges.get(badgeDir, vehicleNumber, (self.height, self.height))
+        # The movement colour only shows when the car number is drawn as text
+        key = (position, vehicleNumber, badgeDir, self.badges.generation(badgeDir),
+               None if badge is not None else color, positionColor)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+        if len(self.sprites) >= self.maxEntries:
+            self.sprites.clear()
+        sprite = self.__render(position, vehicleNumber, badge, color, positionColor)
+        self.sprites[key] = sprite
+        return sprite
+
+    def __render(self, position, vehicleNumber, badge, color, positionColor):
+        self.renders += 1
+        sprite = Image.new('RGB', (self.width, self.height))
+        pixels = sprite.load()
+        size = sprite.size
+        self.font.drawText(pixels, size, self.positionX, self.baselineY, positionColor, f'{position}')
+        if badge is not None:
+            sprite.paste(badge, (self.badgeX, 0))
+        else:
+            self.font.drawText(pixels, size, self.badgeX, self.baselineY, color, f'{vehicleNumber:>2}')
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+    def stats(self):
+        lookups = (self.hits + self.renders) or 1
+        return {'entries': len(self.sprites), 'hits': self.hits, 'renders': self.renders, 'hit_ratio': self.hits / lookups}
@@ -0,0 +1,48 @@
+# Slides leaderboard rows from their old positions to their new ones over a
+# fixed number of frames, driven by a FeedDiff. Only the row y coordinates
+# change from frame to frame; the rows themselves come from RowSprites, so a
+# restart that reshuffles the whole field costs the same per frame as a
+# single pass: one blit per visible row. With a PanelLayout the y values are
+# pylon coordinates taken from its row table, gaps at panel edges included.
+class RowTransitions:
+    def __init__(self, rowHeight=16, top=16, frames=8, layout=None):
+        self.rowHeight = rowHeight
+        self.top = top
+        self.frames = frames
+        self.layout = layout
+        self.diff = None
+
+    def start(self, diff):
+        # Number of frames to draw for this diff: the full slide if any car
+        # moved or joined, otherwise a single still frame.
+        self.diff = diff
+        if diff.previous is None or self.frames <= 1 or not (diff.moves or diff.added):
+            return 1
+        return self.frames
+
+    def rows(self, step, steps):
+        # [(position, vehicle, y)] for frame "step" of "steps" (1-based); the
+        # last frame puts every row exactly in place.
+        diff = self.diff
+        progress = step / steps if steps > 1 else 1.0
+        # Ease out: quick start, gentle landing
+        progress = 1 - (1 - progress) * (1 - progress)
+        count = len(diff.current.vehicles)
+        rows = []
+        position = 0
+        for vehicle in diff.current.vehicles:
+            position += 1
+            move = diff.moves.get(vehicle.vehicleNumber) if diff.moves else None
+            if move is not None:
+                start = move[0]
+            elif diff.added and vehicle.vehicleNumber in diff.added:
+                # New to the field: come in from below the last row
+                start = count + 1
+            else:
+                start = position
+            offset = round((start + (position - start) * progress - 1) * self.rowHeight)
+            if self.layout is not None:
+                rows.append((position, vehicle, self.layout.rowY(0, offset)))
+            else:
+                rows.append((position, vehicle, self.top + offset))
+        return rows
@@ -0,0 +1,60 @@
+import threading
+
+# Fixed-size ring of (timestamp, item) in arrival order. Memory never grows
+# past capacity, and at(t) finds "the newest item no later than t" with a
+# binary search, which is how the renderer plays the race sync_delay seconds
+# behind live to line up with the TV broadcast.
+class SnapshotBuffer:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.times = [0.0] * capacity
+        self.items = [None] * capacity
+        # Slot of the oldest entry and number of entries in use
+        self.start = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def push(self, timestamp, item):
+        # Timestamps must not go backwards or the search breaks; clamp them.
+        with self.lock:
+            if self.count and timestamp < self.times[(self.start + self.count - 1) % self.capacity]:
+                timestamp = self.times[(self.start + self.count - 1) % self.capacity]
+            if self.count < self.capacity:
+                slot = (self.start + self.count) % self.capacity
+                self.count += 1
+            else:
+                # Full: overwrite the oldest
+                slot = self.start
+                self.start = (self.start + 1) % self.capacity
+            self.times[slot] = timestamp
+            self.items[slot] = item
+
+    def at(self, timestamp):
+        # Newest item pushed at or before timestamp. If the buffer does not
+        # reach back that far the oldest item is the best we have.
+        with self.lock:
+            if self.count == 0:
+                return None
+            low, high = 0, self.count
+            while low < high:
+                middle = (low + high) // 2
+                if self.times[(self.start + middle) % self.capacity] <= timestamp:
+                    low = middle + 1
+                else:
+                    high = middle
+            return self.items[(self.start + max(low - 1, 0)) % self.capacity]
+
+    def latest(self):
+        with self.lock:
+            if self.count == 0:
+                return None
+            return self.items[(self.start + self.count - 1) % self.capacity]
+
+    def clear(self):
+        with self.lock:
+            self.items = [None] * self.capacity
+            self.start = 0
+            self.count = 0
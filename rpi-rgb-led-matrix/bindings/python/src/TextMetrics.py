@@ -0,0 +1,23 @@
+# Text measurement for one loaded font. Widths come from the glyph table
+# Font.LoadFont() builds, so they match what DrawText() actually advances,
+# and each distinct string is only measured once.
+class TextMetrics:
+    def __init__(self, font, maxEntries=1024):
+        self.font = font
+        self.height = font.height
+        self.baseline = font.baseline
+        self.maxEntries = maxEntries
+        self.widths = {}
+
+    def width(self, text):
+        try:
+            return self.widths[text]
+        except KeyError:
+            pass
+        if len(self.widths) >= self.maxEntries:
+            # Driver names and lap counts are a small set; this only trips
+            # if something feeds us unbounded text.
+            self.widths.clear()
+        width = self.font.TextWidth(text)
+        self.widths[text] = width
+        return width
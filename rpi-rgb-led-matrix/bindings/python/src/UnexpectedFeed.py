@@ -0,0 +1,5 @@
+# Raised by FeedParser's selective parse when a live-feed body is valid JSON
+# but not shaped like a live feed. Nothing is kept from the body, so the
+# caller forgets the url's validators and fetches it again for a full parse.
+class UnexpectedFeed(Exception):
+    pass
@@ -1,4 +1,9 @@
+from PitStop import PitStop
+
 class Vehicle:
+    __slots__ = ('vehicleNumber', 'lapsCompleted', 'passingDifferential', 'status',
+                 'isOnDVP', 'isOnTrack', 'last_lap_time', '__pitStopData', '__pitstops')
+
     def __init__(self, r):
         self.vehicleNumber = r['vehicle_number']
         self.lapsCompleted = r['laps_completed']
@@ -10,8 +15,24 @@ class Vehicle:
         # ADD THIS LINE (or something similar):
         self.last_lap_time = r.get('last_lap_time', 0.0)
 
-        pitstops = []
-        for pitstopData in r['pit_stops']:
-            pitstop = PitStop(pitstopData)
-            pitstops.append(pitstop)
-        self.pitstops = pitstops
+        # Nothing on the sign reads pit stops every poll, so they are only
+        # turned into PitStop objects the first time someone asks.
+        self.__pitStopData = r['pit_stops']
+        self.__pitstops = None
+
+    @property
+    def pitstops(self):
+        if self.__pitstops is None:
+            self.__pitstops = [PitStop(pitstopData) for pitstopData in self.__pitStopData]
+        return self.__pitstops
+
+    @property
+    def pitStopCount(self):
+        return len(self.__pitStopData)
+
+    @property
+    def lastPitOutElapsedTime(self):
+        # Read straight from the raw stop so FeedDiff never builds PitStops.
+        if not self.__pitStopData:
+            return 0
+        return self.__pitStopData[-1].get('pit_out_elapsed_time', 0)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# Compare the full "json + LiveFeed(data)" path against FeedParser's selective
+# streaming parse on recorded live-feed bodies.
+#
+#   ./bench-feed-parse.py feeds/*.json race.cap.gz [-n 200]
+#
+# Files may be plain JSON, gzip-compressed JSON (*.gz) or FeedRecorder
+# captures (*.cap.gz), of which every live-feed body is used.
+
+import argparse
+import gzip
+import io
+import json
+import time
+import tracemalloc
+from LiveFeed import LiveFeed
+from FeedParser import FeedParser
+from FeedRecorder import FeedRecorder
+from UnexpectedFeed import UnexpectedFeed
+
+def loadBodies(path):
+    if path.endswith('.cap.gz'):
+        return [body for _, _, body in FeedRecorder.read(path) if b'"vehicles"' in body]
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return [f.read()]
+
+def fullParse(body):
+    return LiveFeed(json.load(io.BytesIO(body)))
+
+def selectiveParse(body, parser=FeedParser(selective=True)):
+    try:
+        return LiveFeed(parser.parseLiveFeed(io.BytesIO(body)))
+    except UnexpectedFeed:
+        # ApiClient fetches the body again for a full parse
+        return fullParse(body)
+
+def measure(parse, bodies, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for body in bodies:
+            parse(body)
+    elapsed = (time.perf_counter() - start) / (rounds * len(bodies))
+
+    tracemalloc.start()
+    for body in bodies:
+        parse(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("feeds", nargs="+", help="Recorded live-feed bodies")
+    argparser.add_argument("-n", "--rounds", type=int, default=100, help="Passes over all feeds. Default: 100")
+    args = argparser.parse_args()
+
+    bodies = [body for path in args.feeds for body in loadBodies(path)]
+    size = sum(len(body) for body in bodies) / len(bodies)
+    print(f'{len(bodies)} feeds, {size / 1024:.1f} KiB average body')
+    if FeedParser(selective=True).selective:
+        print('selective parser: ijson ' + __import__('ijson').backend)
+    else:
+        print('selective parser: ijson not installed, FeedParser falls back to json.load')
+
+    for name, parse in (('json + LiveFeed', fullParse), ('FeedParser + LiveFeed', selectiveParse)):
+        elapsed, peak = measure(parse, bodies, args.rounds)
+        print(f'{name:24} {elapsed * 1000:8.3f} ms/feed {peak / 1024:10.1f} KiB peak')
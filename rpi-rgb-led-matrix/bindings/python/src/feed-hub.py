@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# Run one upstream poller for every sign at the venue:
+#
+#   ./feed-hub.py --port 8080 --series CUP XFINITY
+#
+# then set "feed_hub": "http://<hub-ip>:8080/live-ops.json" in each pylon's
+# pylon_config.json. --upstream points the hub at a stand-in server for
+# testing, --replay at a capture from record-feed.py.
+
+import argparse
+import time
+from ApiClient import ApiClient
+from FeedHub import FeedHub
+from ReplayApiClient import ReplayApiClient
+from Series import Series
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8080, help="Port to serve on. Default: 8080")
+    parser.add_argument("--series", nargs="+", default=["CUP"], choices=[s.name for s in Series], help="Series to fan out. Default: CUP")
+    parser.add_argument("--upstream", help="Ops feed URL to poll instead of NASCAR's")
+    parser.add_argument("--replay", help="Serve a capture file instead of polling upstream")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Replay speed multiplier. Default: 1.0")
+    parser.add_argument("--long-poll", type=float, default=3, help="Seconds a pylon is held waiting for a new feed. Default: 3")
+    args = parser.parse_args()
+
+    if args.replay:
+        client = ReplayApiClient(args.replay, speed=args.replay_speed)
+        interval = 2 / args.replay_speed if args.replay_speed > 0 else 0
+    else:
+        client = ApiClient(opsFeedUrl=args.upstream)
+        interval = None
+
+    hub = FeedHub(client, [Series[name] for name in args.series], port=args.port, longPoll=args.long_poll, interval=interval)
+    hub.start()
+    print(f'Serving {", ".join(args.series)} on port {hub.port}')
+    try:
+        while True:
+            time.sleep(60)
+            print(f'sequence {hub.sequence}', client.stats())
+    except KeyboardInterrupt:
+        hub.stop()
@@ -2,7 +2,8 @@
 
 import os
 import time
-from ApiClient import ApiClient
+from FeedPoller import FeedPoller
+from FeedDiff import FeedDiff
 from Colors import Colors
 from FlagStatus import FlagStatus
 from Series import Series
@@ -10,9 +11,9 @@ from Series import Series
 # Import SampleBase from the samplebase module
 from samplebase import SampleBase
 from rgbmatrix import graphics
+from TextMetrics import TextMetrics
 
 # CHANGE THIS TO SEE DIFFERENT SERIES DATA
-positionChange = {}
 
 class RunText(SampleBase):
     def __init__(self, *args, **kwargs):
@@ -37,11 +38,14 @@ class RunText(SampleBase):
 
     def run(self):
         series = Series.CUP
-        client = ApiClient()
-        feed = client.getLiveFeed(series)
+        poller = FeedPoller(series)
+        poller.start()
+        feed = poller.waitForFirst().feed
+        previous_feed = None
         offscreen_canvas = self.matrix.CreateFrameCanvas()
         font = graphics.Font()
         font.LoadFont("../../../fonts/4x6.bdf")
+        metrics = TextMetrics(font)
         textColor = graphics.Color(255, 255, 255)
         whiteColor = graphics.Color(255, 255, 255)
         greenColor = graphics.Color(0, 255, 0)
@@ -52,11 +56,10 @@ class RunText(SampleBase):
 
         # Helper function to calculate text width
         def calculate_text_width(text):
-            char_width = 4
-            char_spacing = 1
-            return len(text) * char_width + (len(text) - 1) * char_spacing
+            return metrics.width(text)
 
         while feed.lapsToGo >= 0:
+            diff = FeedDiff(previous_feed, feed)
             offscreen_canvas.Clear()
             i = 1
 
@@ -71,8 +74,7 @@ class RunText(SampleBase):
                 bgColor = redColor  # Default color if no specific flag status
 
             # Draw background rectangle behind the "Laps" and "To Go" lines
-            for y in range(0, 14):
-                graphics.DrawLine(offscreen_canvas, 0, y, matrix_width - 1, y, bgColor)
+            graphics.FillRect(offscreen_canvas, 0, 0, matrix_width, 14, bgColor)
 
             # Create the text lines
             laps_text = f'{feed.lapsToGo} Laps'
@@ -94,14 +96,13 @@ class RunText(SampleBase):
 
             for vehicle in feed.vehicles:
                 my_text = f'{i:2} {vehicle.vehicleNumber:>2}'
-                if positionChange.get(vehicle.vehicleNumber, i) < i:
+                movement = diff.movement(vehicle.vehicleNumber)
+                if movement < 0:
                     textColor = redColor
-                elif positionChange.get(vehicle.vehicleNumber, i) > i:
+                elif movement > 0:
                     textColor = greenColor
                 else:
                     textColor = whiteColor
-                # Update new position
-                positionChange[vehicle.vehicleNumber] = i
 
                 print(my_text)
 
@@ -113,7 +114,8 @@ class RunText(SampleBase):
 
             offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas)
             time.sleep(2)
-            feed = client.getLiveFeed(series)
+            previous_feed = feed
+            feed = poller.latest().feed
 
 # Main function
 if __name__ == "__main__":
@@ -2,7 +2,8 @@
 
 import os
 import time
-from ApiClient import ApiClient
+from FeedPoller import FeedPoller
+from FeedDiff import FeedDiff
 from Colors import Colors
 from FlagStatus import FlagStatus
 from Series import Series
@@ -35,7 +36,6 @@ def flag(flag):
 
 # CHANGE THIS TO SEE DIFFERENT SERIES DATA
 
-positionChange = {}
 
 
 
@@ -53,8 +53,10 @@ class RunText(SampleBase):
         
     def run(self):
         series = Series.CUP
-        client = ApiClient()
-        feed = client.getLiveFeed(series)
+        poller = FeedPoller(series)
+        poller.start()
+        feed = poller.waitForFirst().feed
+        previous_feed = None
         offscreen_canvas = self.matrix.CreateFrameCanvas()
         font = graphics.Font()
         font.LoadFont("../../../fonts/4x6.bdf")
@@ -69,6 +71,7 @@ class RunText(SampleBase):
 
         
         while feed.lapsToGo >= 0:
+            diff = FeedDiff(previous_feed, feed)
             offscreen_canvas.Clear()
             i = 1
             my_text=""
@@ -78,14 +81,13 @@ class RunText(SampleBase):
             print(f'Laps {feed.lapNumber} Laps To Go {feed.lapsToGo} Flag {flag(feed.flagStatus)}')
             for vehicle in feed.vehicles:
                 my_text == (f'{i:2} {vehicle.vehicleNumber:>2}')
-                if positionChange.get(vehicle.vehicleNumber, i) < i:
+                movement = diff.movement(vehicle.vehicleNumber)
+                if movement < 0:
                     textColor = redColor
-                elif positionChange.get(vehicle.vehicleNumber, i) > i:  
+                elif movement > 0:
                     textColor = greenColor
-                else: 
-                    textColor = whiteColor              
-                # Update new postion
-                positionChange[vehicle.vehicleNumber] = i
+                else:
+                    textColor = whiteColor
              
             
                 print(my_text)
@@ -103,7 +105,8 @@ class RunText(SampleBase):
             
             offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas)
             time.sleep(2)
-            feed = client.getLiveFeed(series)
+            previous_feed = feed
+            feed = poller.latest().feed
 
 # Main function
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# Pack each series' badge directory into one pre-resized atlas file that
+# BadgeCache maps at startup instead of decoding a PNG per car:
+#
+#   ./pack-badges.py --sizes 16x16 10x10 5x5
+#
+# writes /home/tonicinnovations/badges/1.atlas, 2.atlas, ... Re-run after
+# uploading badges; until then the sign falls back to the PNGs.
+
+import argparse
+import os
+from BadgeAtlas import BadgeAtlas
+from BadgeCache import BadgeCache
+
+def parseSize(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--badges", default=BadgeCache.DEFAULT_PATH, help=f"Badge directory. Default: {BadgeCache.DEFAULT_PATH}")
+    parser.add_argument("--sizes", nargs="+", type=parseSize, default=[(16, 16)], help="Sizes to pack, e.g. 16x16 5x5. Default: 16x16")
+    parser.add_argument("--series", nargs="+", help="Badge subdirectories to pack. Default: all of them")
+    args = parser.parse_args()
+
+    directories = args.series or sorted(name for name in os.listdir(args.badges) if os.path.isdir(os.path.join(args.badges, name)))
+    for directory in directories:
+        path = os.path.join(args.badges, directory)
+        count = BadgeAtlas.pack(path, path + '.atlas', args.sizes)
+        print(f'{path}.atlas: {count} badges at {", ".join(f"{w}x{h}" for w, h in args.sizes)}')
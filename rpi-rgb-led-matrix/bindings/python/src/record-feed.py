@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# Record a race without a sign attached, e.g. on a laptop at the track:
+#
+#   ./record-feed.py cup-daytona.cap.gz --series CUP XFINITY
+#
+# The capture can be replayed with ReplayApiClient or `nascar.py --replay`.
+
+import argparse
+import time
+from ApiClient import ApiClient
+from FeedRecorder import FeedRecorder
+from FeedTransport import FeedTransport
+from Series import Series
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("capture", help="Capture file to append to")
+    parser.add_argument("--series", nargs="+", default=["CUP"], choices=[s.name for s in Series], help="Series to record. Default: CUP")
+    parser.add_argument("--interval", type=float, default=2, help="Seconds between polls. Default: 2")
+    args = parser.parse_args()
+
+    recorder = FeedRecorder(args.capture)
+    client = ApiClient(transport=FeedTransport(recorder=recorder), opsCachePath=None)
+    series = [Series[name] for name in args.series]
+    try:
+        while True:
+            for s in series:
+                try:
+                    feed = client.getLiveFeed(s)
+                    print(f'{s.name} lap {feed.lapNumber} to go {feed.lapsToGo} ({recorder.recordCount} records)')
+                except Exception as e:
+                    print(f'{s.name} fetch failed: {e}')
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        recorder.close()
@@ -139,6 +139,19 @@ void DrawCircle(Canvas *c, int x, int y, int radius, const Color &color);
 // Draw a line from "x0", "y0" to "x1", "y1" and with "color"
 void DrawLine(Canvas *c, int x0, int y0, int x1, int y1, const Color &color);
 
+// Fill the "width" x "height" rectangle with its top left corner at "x", "y"
+// with "color". Much cheaper than a DrawLine() per row: the rectangle is
+// clipped to the canvas once and then written pixel by pixel.
+void FillRect(Canvas *c, int x, int y, int width, int height,
+              const Color &color);
+
+// Draw the one pixel wide outline of the same rectangle.
+void DrawRect(Canvas *c, int x, int y, int width, int height,
+              const Color &color);
+
+// Set the rectangle to black.
+void ClearRect(Canvas *c, int x, int y, int width, int height);
+
 }  // namespace rgb_matrix
 
 #endif  // RPI_GRAPHICS_H
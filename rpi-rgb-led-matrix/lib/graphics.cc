@@ -169,4 +169,30 @@ void DrawLine(Canvas *c, int x0, int y0, int x1, int y1, const Color &color) {
   }
 }
 
+void FillRect(Canvas *c, int x, int y, int width, int height,
+              const Color &color) {
+  const int x0 = std::max(x, 0);
+  const int y0 = std::max(y, 0);
+  const int x1 = std::min(x + width, c->width());
+  const int y1 = std::min(y + height, c->height());
+  for (int py = y0; py < y1; ++py) {
+    for (int px = x0; px < x1; ++px) {
+      c->SetPixel(px, py, color.r, color.g, color.b);
+    }
+  }
+}
+
+void DrawRect(Canvas *c, int x, int y, int width, int height,
+              const Color &color) {
+  if (width <= 0 || height <= 0) return;
+  FillRect(c, x, y, width, 1, color);
+  FillRect(c, x, y + height - 1, width, 1, color);
+  FillRect(c, x, y + 1, 1, height - 2, color);
+  FillRect(c, x + width - 1, y + 1, 1, height - 2, color);
+}
+
+void ClearRect(Canvas *c, int x, int y, int width, int height) {
+  FillRect(c, x, y, width, height, Color(0, 0, 0));
+}
+
 }//namespace